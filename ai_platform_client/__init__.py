@@ -0,0 +1,20 @@
+"""
+Python client for the AI Platform API
+
+    from ai_platform_client import Client, Timings
+
+    timings = Timings()
+    with Client(hooks=[timings]) as api:
+        reply = api.chat([{"role": "user", "content": "Hello"}])
+        api.analyze_file("report.pdf")
+    print(timings.table())
+
+AsyncClient exposes the same methods as coroutines; both offer batch() for
+bounded-concurrency fan-out.
+"""
+
+from .client import AsyncClient, Client
+from .multipart import MultipartStream
+from .transport import ApiError, CallStats, Timings, Transport, percentile
+
+__all__ = ["ApiError", "AsyncClient", "CallStats", "Client", "MultipartStream", "Timings", "Transport", "percentile"]
@@ -0,0 +1,239 @@
+"""
+Sync and asyncio clients for the AI Platform API
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from .multipart import MultipartStream, file_part
+from .transport import DEFAULT_ADMIN_TOKEN, DEFAULT_MAX_CONNECTIONS, DEFAULT_TIMEOUT, ApiError, Transport
+
+
+class Client:
+    """
+    Blocking client. Every endpoint method returns the decoded JSON body and
+    raises ApiError for error statuses; use request() for the raw response.
+    """
+
+    def __init__(self, base_url=None, timeout=DEFAULT_TIMEOUT, max_connections=DEFAULT_MAX_CONNECTIONS,
+                 hooks=None, transport=None, admin_token=DEFAULT_ADMIN_TOKEN):
+        self._owns_transport = transport is None
+        self.transport = transport or Transport(base_url, timeout, max_connections, hooks, admin_token)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._owns_transport:
+            self.transport.close()
+
+    def request(self, method, path, **kwargs):
+        return self.transport.request(method, path, **kwargs)
+
+    def _raise(self, r, body=None):
+        message = body.get("error") if isinstance(body, dict) else None
+        raise ApiError(r.status_code, message or r.reason or r.text[:200], body, r)
+
+    def _json(self, method, path, route=None, **kwargs):
+        r = self.request(method, path, route=route, **kwargs)
+        try:
+            body = r.json()
+        except ValueError:
+            body = None
+        if r.status_code >= 400:
+            self._raise(r, body)
+        if body is None:
+            r.json()  # re-raise the decode error for a 2xx with a non-JSON body
+        return body
+
+    # ---- system ----
+
+    def root(self, timeout=None):
+        return self._json("GET", "/", timeout=timeout)
+
+    def usage(self, timeout=None):
+        return self._json("GET", "/system/usage", timeout=timeout)
+
+    def health(self, timeout=None):
+        return self._json("GET", "/system/health", timeout=timeout)
+
+    def warmup_status(self, timeout=None):
+        return self._json("GET", "/system/warmup", timeout=timeout)
+
+    def compaction_status(self, timeout=None):
+        return self._json("GET", "/system/compaction", timeout=timeout)
+
+    def compact(self, session_days=None, file_days=None, vacuum=None, id_prefix=None, timeout=None):
+        """Admin: runs a compaction pass now, optionally only over ids starting with id_prefix"""
+        payload = {"sessionDays": session_days, "fileDays": file_days, "vacuum": vacuum, "idPrefix": id_prefix}
+        return self._json("POST", "/system/compact", json={k: v for k, v in payload.items() if v is not None},
+                          timeout=timeout)
+
+    # ---- settings ----
+
+    def get_settings(self, timeout=None):
+        return self._json("GET", "/settings", timeout=timeout)
+
+    def update_settings(self, settings, timeout=None):
+        return self._json("POST", "/settings", json=settings, timeout=timeout)
+
+    # ---- chat ----
+
+    def chat(self, messages, model=None, temperature=None, max_tokens=None, session_id=None, timeout=None):
+        payload = {"messages": messages, "model": model, "temperature": temperature,
+                   "max_tokens": max_tokens, "sessionId": session_id}
+        payload = {k: v for k, v in payload.items() if v is not None}
+        return self._json("POST", "/chat/completions", json=payload, timeout=timeout)
+
+    def list_sessions(self, timeout=None):
+        return self._json("GET", "/chat/sessions", timeout=timeout)
+
+    def get_session(self, session_id, timeout=None):
+        return self._json("GET", f"/chat/sessions/{quote(session_id, safe='')}", route="/chat/sessions/:id",
+                          timeout=timeout)
+
+    def rename_session(self, session_id, title, timeout=None):
+        return self._json("PATCH", f"/chat/sessions/{quote(session_id, safe='')}", route="/chat/sessions/:id",
+                          json={"title": title}, timeout=timeout)
+
+    def delete_session(self, session_id, timeout=None):
+        return self._json("DELETE", f"/chat/sessions/{quote(session_id, safe='')}", route="/chat/sessions/:id",
+                          timeout=timeout)
+
+    def delete_sessions(self, prefix, timeout=None):
+        """Admin: deletes every session whose id starts with prefix; returns how many"""
+        return self._json("DELETE", "/chat/sessions", params={"prefix": prefix}, timeout=timeout)["deleted"]
+
+    # ---- backup (admin) ----
+
+    def export_data(self, sink, types=None, since=None, gzip=False, timeout=None):
+        """
+        Streams the NDJSON dump into sink (a binary file object) exactly as sent,
+        i.e. still gzip-compressed with gzip=True; returns the raw response
+        """
+        params = {"types": ",".join(types) if types else None, "since": since, "gzip": "1" if gzip else None}
+        r = self.request("GET", "/export", params={k: v for k, v in params.items() if v}, sink=sink,
+                         timeout=timeout)
+        if r.status_code >= 400:
+            self._raise(r)
+        return r
+
+    def import_data(self, body, gzip=False, timeout=None):
+        """Uploads an NDJSON dump (bytes, file object or iterable of bytes, streamed as given)"""
+        headers = {"Content-Type": "application/gzip" if gzip else "application/x-ndjson"}
+        return self._json("POST", "/import", data=body, headers=headers, timeout=timeout)
+
+    # ---- files ----
+
+    def analyze_file(self, file, filename=None, content_type=None, field="file", timeout=None):
+        """Uploads a path, bytes or binary file object; the body is streamed, never buffered whole"""
+        body = MultipartStream(files=[(field, file_part(file, filename, content_type))])
+        return self._json("POST", "/files/analyze", data=body, headers=body.headers, timeout=timeout)
+
+    # ---- news & companies ----
+
+    def latest_news(self, lang=None, timeout=None):
+        return self._json("GET", "/news/latest", params={"lang": lang} if lang else None, timeout=timeout)
+
+    def search_news(self, q, lang=None, timeout=None):
+        params = {"q": q, **({"lang": lang} if lang else {})}
+        return self._json("GET", "/news/search", params=params, timeout=timeout)
+
+    def search_companies(self, q, timeout=None):
+        return self._json("GET", "/companies/search", params={"q": q}, timeout=timeout)
+
+    # ---- batching ----
+
+    def batch(self, func, items, limit=None, return_exceptions=False):
+        """
+        Calls func(item) for every item with at most `limit` in flight (capped
+        at the pool size) and returns the results in input order.
+        """
+        limit = min(limit or self.transport.max_connections, self.transport.max_connections)
+        with ThreadPoolExecutor(max_workers=limit) as pool:
+            futures = [pool.submit(func, item) for item in items]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    if not return_exceptions:
+                        for f in futures:
+                            f.cancel()
+                        raise
+                    results.append(e)
+            return results
+
+
+ENDPOINTS = (
+    "root", "usage", "health", "warmup_status", "compaction_status", "compact", "get_settings", "update_settings",
+    "chat", "list_sessions", "get_session", "rename_session", "delete_session", "delete_sessions", "export_data",
+    "import_data", "analyze_file", "latest_news", "search_news", "search_companies",
+)
+
+
+def _async_endpoint(name):
+    sync = getattr(Client, name)
+
+    @functools.wraps(sync)
+    async def method(self, *args, **kwargs):
+        return await self._run(getattr(self.sync, name), *args, **kwargs)
+
+    return method
+
+
+class AsyncClient:
+    """
+    asyncio client over the same pooled transport. Calls run on a worker pool
+    sized to the connection pool, so awaiting many of them at once never opens
+    more than max_connections sockets. Pass transport=client.transport to share
+    connections with an existing sync Client.
+    """
+
+    def __init__(self, base_url=None, timeout=DEFAULT_TIMEOUT, max_connections=DEFAULT_MAX_CONNECTIONS,
+                 hooks=None, transport=None, admin_token=DEFAULT_ADMIN_TOKEN):
+        self.sync = Client(base_url, timeout, max_connections, hooks, transport, admin_token)
+        self.transport = self.sync.transport
+        self._executor = ThreadPoolExecutor(max_workers=self.transport.max_connections,
+                                            thread_name_prefix="ai-platform-client")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        # Queued calls are cancelled, but calls already on the wire finish before the transport closes
+        shutdown = functools.partial(self._executor.shutdown, wait=True, cancel_futures=True)
+        await asyncio.get_running_loop().run_in_executor(None, shutdown)
+        self.sync.close()
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def request(self, method, path, **kwargs):
+        return await self._run(self.sync.request, method, path, **kwargs)
+
+    async def batch(self, func, items, limit=None, return_exceptions=False):
+        """
+        Awaits func(item) for every item with at most `limit` coroutines in
+        flight and returns the results in input order.
+        """
+        semaphore = asyncio.Semaphore(limit or self.transport.max_connections)
+
+        async def run(item):
+            async with semaphore:
+                return await func(item)
+
+        return await asyncio.gather(*(run(item) for item in items), return_exceptions=return_exceptions)
+
+
+for _name in ENDPOINTS:
+    setattr(AsyncClient, _name, _async_endpoint(_name))
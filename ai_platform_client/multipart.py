@@ -0,0 +1,101 @@
+"""
+Streaming multipart/form-data encoder: file parts are read in chunks while the
+request is being sent instead of being buffered in memory first
+"""
+
+import mimetypes
+import os
+import uuid
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _quote(value):
+    return str(value).replace("\\", "\\\\").replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+def _size(source):
+    """Remaining bytes in source, or None when it cannot be known up front"""
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    try:
+        return os.fstat(source.fileno()).st_size - source.tell()
+    except (AttributeError, OSError, ValueError):
+        pass
+    try:
+        pos = source.tell()
+        end = source.seek(0, os.SEEK_END)
+        source.seek(pos)
+        return end - pos
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def file_part(source, filename=None, content_type=None):
+    """Normalises a path, bytes or binary file object into (filename, source, content_type)"""
+    if filename is None:
+        name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", None)
+        filename = os.path.basename(os.fspath(name)) if isinstance(name, (str, os.PathLike)) else "upload"
+    if content_type is None:
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    return filename, source, content_type
+
+
+class MultipartStream:
+    """
+    Iterable request body for requests/urllib3. When every part has a known
+    size the total is exposed through __len__ so the upload goes out with a
+    Content-Length; otherwise it falls back to chunked transfer encoding.
+
+    fields: {name: value}; files: [(field, (filename, path | bytes | file, content_type))]
+    """
+
+    def __init__(self, fields=None, files=None, chunk_size=CHUNK_SIZE):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+        self._parts = []
+        for name, value in (fields or {}).items():
+            head = f'--{self.boundary}\r\nContent-Disposition: form-data; name="{_quote(name)}"\r\n\r\n'
+            self._parts.append((head.encode(), str(value).encode()))
+        for name, (filename, source, content_type) in files or []:
+            head = (f'--{self.boundary}\r\nContent-Disposition: form-data; name="{_quote(name)}"; '
+                    f'filename="{_quote(filename)}"\r\nContent-Type: {content_type}\r\n\r\n')
+            self._parts.append((head.encode(), source))
+        self._tail = f"--{self.boundary}--\r\n".encode()
+        sizes = [_size(source) for _, source in self._parts]
+        self.length = None if None in sizes else sum(len(h) + n + 2 for (h, _), n in zip(self._parts, sizes)) + len(self._tail)
+
+    @property
+    def headers(self):
+        return {"Content-Type": self.content_type}
+
+    def _read(self, source):
+        if isinstance(source, (bytes, bytearray)):
+            yield bytes(source)
+            return
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as f:
+                yield from self._read(f)
+            return
+        while True:
+            chunk = source.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def __iter__(self):
+        for head, source in self._parts:
+            yield head
+            yield from self._read(source)
+            yield b"\r\n"
+        yield self._tail
+
+    def __len__(self):
+        # requests treats 0 as "unknown" and switches to chunked encoding
+        return self.length or 0
+
+    def __bool__(self):
+        return True
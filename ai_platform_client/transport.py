@@ -0,0 +1,191 @@
+"""
+Pooled keep-alive HTTP transport shared by the sync and asyncio clients,
+with per-call timing hooks
+"""
+
+import os
+import statistics
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import brotli
+except ImportError:  # optional, as in urllib3: br bodies are then left encoded
+    brotli = None
+
+DEFAULT_BASE_URL = f"{os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')}/api"
+# (connect, read) seconds; chat completions and file analysis wait on Gemini
+DEFAULT_TIMEOUT = (5.0, float(os.getenv('API_TIMEOUT', 120)))
+DEFAULT_MAX_CONNECTIONS = 10
+# Sent as a bearer token; the server requires it for /export, /import, bulk deletes and /system/compact
+DEFAULT_ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+STREAM_CHUNK = 64 * 1024
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty sequence"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def decode_body(body, content_encoding):
+    """Undoes Content-Encoding (last applied first); unknown codings are left as they are"""
+    for coding in reversed([c.strip().lower() for c in (content_encoding or "").split(",") if c.strip()]):
+        if coding in ("gzip", "x-gzip"):
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        elif coding == "deflate":
+            try:
+                body = zlib.decompress(body)
+            except zlib.error:
+                body = zlib.decompress(body, -zlib.MAX_WBITS)
+        elif coding == "br" and brotli is not None:
+            body = brotli.decompress(body)
+        elif coding != "identity":
+            break
+    return body
+
+
+class ApiError(Exception):
+    """Raised for 4xx/5xx responses; carries the status and the decoded error body"""
+
+    def __init__(self, status, message, body=None, response=None):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+        self.body = body
+        self.response = response
+
+
+@dataclass
+class CallStats:
+    """What a timing hook receives once per request, successful or not"""
+    method: str
+    route: str
+    url: str
+    status: Optional[int] = None
+    ttfb_ms: Optional[float] = None
+    elapsed_ms: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None and self.status < 400
+
+
+class Timings:
+    """Timing hook that keeps every CallStats and summarises them per route"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = []
+
+    def __call__(self, stats):
+        with self._lock:
+            self.calls.append(stats)
+
+    def drain(self):
+        """Returns the calls recorded so far and starts over, e.g. once per reporting window"""
+        with self._lock:
+            calls, self.calls = self.calls, []
+        return calls
+
+    def summary(self):
+        with self._lock:
+            calls = list(self.calls)
+        routes = {}
+        for c in calls:
+            routes.setdefault(f"{c.method} {c.route}", []).append(c)
+        result = {}
+        for name, group in routes.items():
+            ms = [c.elapsed_ms for c in group]
+            result[name] = {
+                "count": len(group),
+                "errors": sum(1 for c in group if not c.ok),
+                "p50": statistics.median(ms),
+                "p95": percentile(ms, 95),
+                "max": max(ms),
+                "bytes": sum(c.bytes_received for c in group),
+            }
+        return result
+
+    def table(self):
+        lines = [f"{'route':<32}{'calls':>6}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'KiB in':>10}"]
+        for name, s in sorted(self.summary().items()):
+            lines.append(f"{name:<32}{s['count']:>6}{s['errors']:>8}{s['p50']:>10.1f}{s['p95']:>10.1f}"
+                         f"{s['max']:>10.1f}{s['bytes'] / 1024:>10.1f}")
+        return "\n".join(lines)
+
+
+class Transport:
+    """
+    One requests.Session over a bounded urllib3 pool. Connections are kept
+    alive between calls and reused across threads; once max_connections are
+    busy further calls wait for a free one instead of opening extras.
+    """
+
+    def __init__(self, base_url=None, timeout=DEFAULT_TIMEOUT, max_connections=DEFAULT_MAX_CONNECTIONS, hooks=None,
+                 admin_token=DEFAULT_ADMIN_TOKEN):
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.hooks = list(hooks or [])
+        self.session = requests.Session()
+        if admin_token:
+            self.session.headers["Authorization"] = f"Bearer {admin_token}"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections, pool_block=True, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def request(self, method, path, route=None, timeout=None, sink=None, **kwargs):
+        """
+        Sends one request and returns the fully read requests.Response. With a
+        sink (any object with write()), the body is copied there as it arrives,
+        still content-encoded, instead of being held in memory.
+        """
+        url = f"{self.base_url}{path}"
+        stats = CallStats(method=method, route=route or path.split("?")[0], url=url)
+        start = time.perf_counter()
+        try:
+            r = self.session.request(method, url, timeout=timeout or self.timeout, stream=True, **kwargs)
+            stats.ttfb_ms = (time.perf_counter() - start) * 1000
+            stats.status = r.status_code
+            # Counted off the raw stream, i.e. before Content-Encoding is undone; urllib3's own
+            # tell() stays at 0 for chunked responses
+            if sink is None or r.status_code >= 400:
+                chunks = list(r.raw.stream(STREAM_CHUNK, decode_content=False))
+                stats.bytes_received = sum(len(c) for c in chunks)
+                r._content = decode_body(b"".join(chunks), r.headers.get("Content-Encoding"))
+            else:
+                for chunk in r.raw.stream(STREAM_CHUNK, decode_content=False):
+                    stats.bytes_received += len(chunk)
+                    sink.write(chunk)
+                r._content = b""
+            r._content_consumed = True
+            r.close()
+            stats.bytes_sent = int(r.request.headers.get("Content-Length") or 0)
+            return r
+        except BaseException as e:
+            stats.error = e
+            raise
+        finally:
+            stats.elapsed_ms = (time.perf_counter() - start) * 1000
+            for hook in self.hooks:
+                hook(stats)
+
+    def close(self):
+        self.session.close()
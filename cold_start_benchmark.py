@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Cold Start Benchmark for the AI Platform API
+Restarts the Next.js server before every sample and measures time-to-first-response per route
+"""
+
+import argparse
+import json
+import os
+import shlex
+import signal
+import socket
+import statistics
+import subprocess
+import time
+from urllib.parse import urlparse
+
+from ai_platform_client import Client, Timings
+from ai_platform_client.transport import DEFAULT_BASE_URL
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (name, method, path, request kwargs). LLM-backed routes are opt-in because they bill the Gemini key.
+ROUTES = [
+    ("root", "GET", "/", {}),
+    ("settings", "GET", "/settings", {}),
+    ("chat_sessions", "GET", "/chat/sessions", {}),
+    ("system_usage", "GET", "/system/usage", {}),
+    ("news_latest", "GET", "/news/latest", {}),
+    ("news_search", "GET", "/news/search?q=openai", {}),
+    ("companies_search", "GET", "/companies/search?q=nvidia", {}),
+    ("not_found", "GET", "/nonexistent", {}),
+]
+LLM_ROUTES = [
+    ("chat_completions", "POST", "/chat/completions",
+     {"json": {"messages": [{"role": "user", "content": "Reply with OK."}], "max_tokens": 5}}),
+]
+# Production starts the warm-up scheduler and compaction job from instrumentation.js; their
+# upstream/DB traffic would overlap the measurement and pre-fill the caches being measured
+QUIET_ENV = {"WARMUP_ENABLED": "false", "COMPACTION_ENABLED": "false"}
+# Routes whose successful response is kept in the process cache, so their warm request never goes upstream
+PROCESS_CACHED = {"news_latest", "companies_search"}
+
+
+def wait_for_port(host, port, proc, timeout):
+    """Block until the server accepts TCP connections without touching any HTTP route"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited early with code {proc.returncode}")
+        try:
+            with socket.create_connection((host, port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"Server did not listen on {host}:{port} within {timeout}s")
+
+
+def stop_server(proc):
+    if proc.poll() is not None:
+        return
+    os.killpg(proc.pid, signal.SIGTERM)
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.wait()
+
+
+def measure_route(cmd, method, path, kwargs, ready_timeout, request_timeout, env=None):
+    """Start a fresh server, then time the first and a second (warm) request to one route"""
+    timings = Timings()
+    api = Client(timeout=request_timeout, max_connections=1, hooks=[timings])
+    url = urlparse(api.transport.base_url)
+    host, port = url.hostname or "localhost", url.port or 80
+    spawned = time.perf_counter()
+    proc = subprocess.Popen(
+        shlex.split(cmd), cwd=ROOT_DIR, start_new_session=True, env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_port(host, port, proc, ready_timeout)
+        listening = time.perf_counter()
+
+        api.request(method, path, **kwargs)
+        first_done = time.perf_counter()
+        api.request(method, path, **kwargs)
+        first, warm = timings.calls
+
+        return {
+            "status": first.status,
+            "boot_ms": (listening - spawned) * 1000,
+            "first_ms": first.elapsed_ms,
+            "ttfr_ms": (first_done - spawned) * 1000,
+            "warm_ms": warm.elapsed_ms,
+        }
+    finally:
+        api.close()
+        stop_server(proc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--cmd", default=os.getenv("SERVER_CMD", "yarn start"),
+                        help="command that starts the server (default: yarn start, needs a prior build)")
+    parser.add_argument("--runs", type=int, default=3, help="restarts per route")
+    parser.add_argument("--routes", nargs="*", help="subset of route names to measure")
+    parser.add_argument("--include-llm", action="store_true", help="also measure Gemini-backed routes")
+    parser.add_argument("--ready-timeout", type=float, default=60.0)
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--json", dest="json_out", help="write raw samples to this file")
+    parser.add_argument("--background-jobs", action="store_true",
+                        help="leave the warm-up scheduler and compaction job enabled (off by default)")
+    args = parser.parse_args()
+    env = {} if args.background_jobs else QUIET_ENV
+
+    routes = ROUTES + (LLM_ROUTES if args.include_llm else [])
+    if args.routes:
+        routes = [r for r in routes if r[0] in args.routes]
+
+    print("🧊 COLD START BENCHMARK")
+    print(f"Server command: {args.cmd}")
+    print(f"Server env: {' '.join(f'{k}={v}' for k, v in env.items()) or '(inherited)'}")
+    print(f"API Base: {DEFAULT_BASE_URL}")
+    print("=" * 90)
+    print(f"{'route':<20}{'status':>7}{'boot ms':>11}{'first ms':>11}{'TTFR ms':>11}{'warm ms':>10}{'penalty':>9}{'warm':>12}")
+
+    report = {}
+    for name, method, path, kwargs in routes:
+        samples = []
+        for _ in range(args.runs):
+            try:
+                samples.append(measure_route(args.cmd, method, path, kwargs, args.ready_timeout, args.request_timeout, env))
+            except Exception as e:
+                print(f"❌ {name} - Error: {e}")
+        if not samples:
+            continue
+        report[name] = samples
+        med = {k: statistics.median(s[k] for s in samples) for k in ("boot_ms", "first_ms", "ttfr_ms", "warm_ms")}
+        penalty = med["first_ms"] / med["warm_ms"] if med["warm_ms"] else 0
+        # Failed lookups are not cached, so only a successful first response makes the warm one a hit
+        hits = sum(s["status"] == 200 for s in samples) if name in PROCESS_CACHED else 0
+        # A cache-hit warm time is not a warm *upstream* call, so its penalty includes the upstream latency
+        warm = f"cached {hits}/{len(samples)}" if hits else "live"
+        print(f"{name:<20}{samples[-1]['status']:>7}{med['boot_ms']:>11.1f}{med['first_ms']:>11.1f}"
+              f"{med['ttfr_ms']:>11.1f}{med['warm_ms']:>10.1f}{penalty:>8.1f}x{warm:>12}")
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRaw samples written to {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Retention/Compaction Benchmark
+Seeds a database with old and recent sessions, measures query latency, runs
+POST /system/compact (archive + VACUUM) and measures again.
+Only the seeded sessions are archived and they are deleted again at the end, but
+the VACUUM rewrites the whole database file. Needs ADMIN_TOKEN, like the server.
+"""
+
+import argparse
+import os
+import statistics
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from ai_platform_client import ApiError, Client, Timings
+from export_import_benchmark import TIMEOUT, encoded, synthetic_lines
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+QUERIES = [
+    ("chat_sessions", "/chat/sessions"),
+    ("system_usage", "/system/usage"),
+    ("export_sessions", "/export?types=sessions"),
+]
+
+
+def seed(api, prefix, count, message_kb, age_days):
+    start = datetime.now(timezone.utc) - timedelta(days=age_days)
+    api.import_data(encoded(synthetic_lines(count, message_kb, prefix, start)))
+
+
+def measure(api, samples):
+    """p50/p95 per query, keyed by query name"""
+    timings = api.transport.add_hook(Timings())
+    try:
+        for name, path in QUERIES:
+            for _ in range(samples):
+                api.request("GET", path, route=name)
+    finally:
+        api.transport.remove_hook(timings)
+    return {key.split(" ", 1)[1]: s for key, s in timings.summary().items()}
+
+
+def db_size(path):
+    total = 0
+    for suffix in ("", "-wal"):
+        if os.path.exists(path + suffix):
+            total += os.path.getsize(path + suffix)
+    return total
+
+
+def benchmark(api, args, old_prefix, recent_prefix):
+    mib = 2 ** 20
+    seed(api, old_prefix, args.old, args.message_kb, args.retention_days * 2 + args.old / 1440)
+    seed(api, recent_prefix, args.recent, args.message_kb, 1)
+    print(f"Seeded {args.old} old and {args.recent} recent sessions (~{args.message_kb} KiB each)")
+
+    size_before = db_size(args.db)
+    before = measure(api, args.samples)
+
+    timings = api.transport.add_hook(Timings())
+    try:
+        run = api.compact(session_days=args.retention_days, vacuum=True, id_prefix=old_prefix)
+    finally:
+        api.transport.remove_hook(timings)
+    compact_s = timings.calls[-1].elapsed_ms / 1000
+    print(f"Compaction: archived {run['archived']} in {compact_s:.2f}s (vacuum: {run['vacuumed']})")
+
+    size_after = db_size(args.db)
+    after = measure(api, args.samples)
+
+    print(f"\n{'query':<18}{'p50 before':>12}{'p50 after':>12}{'p95 before':>12}{'p95 after':>12}{'speedup':>9}")
+    for name, _ in QUERIES:
+        b, a = before[name], after[name]
+        speedup = b["p50"] / a["p50"] if a["p50"] else 0
+        print(f"{name:<18}{b['p50']:>12.1f}{a['p50']:>12.1f}{b['p95']:>12.1f}{a['p95']:>12.1f}{speedup:>8.1f}x")
+
+    if size_before:
+        print(f"\nDatabase size: {size_before / mib:.1f} MiB -> {size_after / mib:.1f} MiB")
+
+    timings = api.transport.add_hook(Timings())
+    try:
+        for i in range(min(args.restores, args.old)):
+            try:
+                session = api.get_session(f"{old_prefix}{i:08d}")
+            except ApiError as e:
+                session = {"status": e.status}
+            if not session.get("messages"):
+                print(f"❌ Restore of {old_prefix}{i:08d} failed: {session.get('status', 'empty transcript')}")
+                return False
+    finally:
+        api.transport.remove_hook(timings)
+    restore_ms = [c.elapsed_ms for c in timings.calls]
+    if restore_ms:
+        print(f"Restore on access: median {statistics.median(restore_ms):.1f} ms over {len(restore_ms)} sessions")
+
+    print("✅ Compaction benchmark complete")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--old", type=int, default=5000, help="sessions seeded past the retention window")
+    parser.add_argument("--recent", type=int, default=200, help="sessions seeded inside the retention window")
+    parser.add_argument("--message-kb", type=int, default=8)
+    parser.add_argument("--retention-days", type=float, default=90)
+    parser.add_argument("--samples", type=int, default=20, help="requests per query and phase")
+    parser.add_argument("--db", default=os.path.join(ROOT_DIR, "prisma", "dev.db"), help="SQLite file, for size reporting")
+    parser.add_argument("--restores", type=int, default=10, help="archived sessions to open afterwards")
+    args = parser.parse_args()
+
+    api = Client(timeout=TIMEOUT, max_connections=1)
+
+    print("🗜️  COMPACTION BENCHMARK")
+    print(f"API Base: {api.transport.base_url}")
+    print("=" * 60)
+
+    run_id = uuid.uuid4().hex[:8]
+    old_prefix, recent_prefix = f"compact-{run_id}-old-", f"compact-{run_id}-new-"
+    try:
+        return benchmark(api, args, old_prefix, recent_prefix)
+    finally:
+        removed = api.delete_sessions(old_prefix) + api.delete_sessions(recent_prefix)
+        print(f"Cleanup: removed {removed} seeded sessions")
+        api.close()
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -25,6 +25,7 @@ import {
 } from '@/components/ui/select'
 import { ScrollArea } from '@/components/ui/scroll-area'
 import { useToast } from '@/hooks/use-toast'
+import { useApiMutation } from '@/hooks/use-api'
 import ReactMarkdown from 'react-markdown'
 import { Prism as SyntaxHighlighter } from 'react-syntax-highlighter'
 import { oneDark } from 'react-syntax-highlighter/dist/esm/styles/prism'
@@ -52,6 +53,7 @@ export function ChatModule() {
     const [dragging, setDragging] = useState(false)
     const messagesEndRef = useRef(null)
     const { toast } = useToast()
+    const { mutate } = useApiMutation()
 
     const GUTTER_WIDTH = 8
     const MIN_WIDTH = 100
@@ -98,30 +100,49 @@ export function ChatModule() {
         }
     }, [dragging, sidebarWidth])
 
+    // Archived sessions are listed as stubs; fetching one restores its transcript
+    // The current chat only switches once the transcript is loaded, so a failed restore
+    // never leaves the previous messages posted under the archived session's id
+    async function openSession(s) {
+        if (!s.archived) {
+            setCurrentSessionId(s.id)
+            setMessages(s.messages)
+            return
+        }
+        try {
+            const res = await fetch(`/api/chat/sessions/${s.id}`)
+            if (!res.ok) throw new Error((await res.json().catch(() => ({}))).error || 'Failed to restore chat')
+            const full = await res.json()
+            setCurrentSessionId(full.id)
+            setMessages(full.messages)
+            setSessions((prev) => prev.map((p) => (p.id === full.id ? full : p)))
+        } catch (err) {
+            console.error(err)
+            toast({ title: 'Error', description: err.message || 'Failed to restore chat', variant: 'destructive' })
+        }
+    }
+
     async function renameSession(id) {
         const title = prompt('New title?')
         if (!title) return
-        const res = await fetch(`/api/chat/sessions/${id}`, {
-            method: 'PATCH',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ title }),
-        })
-        if (res.ok) {
+        try {
+            const updated = await mutate(`/api/chat/sessions/${id}`, {
+                method: 'PATCH',
+                body: JSON.stringify({ title }),
+            })
             toast({ title: 'Renamed' })
-            const updated = await res.json()
             setSessions(updated)
-        }
+        } catch { }
     }
 
     async function deleteSession(id) {
         if (!confirm('Delete this chat?')) return
-        const res = await fetch(`/api/chat/sessions/${id}`, { method: 'DELETE' })
-        if (res.ok) {
+        try {
+            const updated = await mutate(`/api/chat/sessions/${id}`, { method: 'DELETE' })
             toast({ title: 'Deleted' })
             if (currentSessionId === id) startNewChat()
-            const updated = await res.json()
             setSessions(updated)
-        }
+        } catch { }
     }
 
     async function sendMessage() {
@@ -150,8 +171,16 @@ export function ChatModule() {
                     max_tokens: 1000,
                 }),
             })
-            if (!res.ok) throw new Error((await res.json()).error || 'Failed')
             const data = await res.json()
+            if (res.status === 409 && data.session) {
+                // Archived while open: show the restored transcript and let the user resend
+                toast({ title: 'Chat reloaded', description: data.error, variant: 'destructive' })
+                setMessages(data.session.messages)
+                setSessions((prev) => prev.map((p) => (p.id === data.session.id ? data.session : p)))
+                setInput(userMsg.content)
+                return
+            }
+            if (!res.ok) throw new Error(data.error || 'Failed')
             const botMsg = {
                 id: Date.now().toString(),
                 role: 'assistant',
@@ -236,10 +265,7 @@ export function ChatModule() {
                                         ? 'bg-primary text-primary-foreground'
                                         : 'hover:bg-accent'
                                     }`}
-                                onClick={() => {
-                                    setMessages(s.messages)
-                                    setCurrentSessionId(s.id)
-                                }}
+                                onClick={() => openSession(s)}
                             >
                                 <div className="flex-1 overflow-hidden">
                                     <p className="text-sm font-medium truncate">{s.title}</p>
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Compression and Conditional GET Benchmark
+Measures bytes on the wire and response time for JSON-heavy endpoints with
+identity, gzip and brotli encodings, and for revalidation via If-None-Match
+and If-Modified-Since
+"""
+
+import argparse
+import statistics
+import time
+from email.utils import parsedate_to_datetime
+
+from ai_platform_client import Client, Timings
+
+ENDPOINTS = [
+    ("chat_sessions", "/chat/sessions"),
+    ("news_latest", "/news/latest"),
+    ("news_search", "/news/search?q=openai"),
+    ("companies_search", "/companies/search?q=google"),
+]
+
+
+def recently_modified(headers):
+    """True when Last-Modified is within a second of Date, i.e. the server may still be holding it back"""
+    try:
+        age = parsedate_to_datetime(headers["Date"]) - parsedate_to_datetime(headers["Last-Modified"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    return age.total_seconds() <= 1
+
+
+def run_mode(api, path, headers, samples):
+    """Median wire bytes (still content-encoded) and latency over `samples` requests"""
+    timings = api.transport.add_hook(Timings())
+    try:
+        for _ in range(samples):
+            api.request("GET", path, headers=headers)
+    finally:
+        api.transport.remove_hook(timings)
+    return {
+        "status": "/".join(str(s) for s in sorted({c.status for c in timings.calls})),
+        "bytes": statistics.median(c.bytes_received for c in timings.calls),
+        "ms": timings.summary()[f"GET {path.split('?')[0]}"]["p50"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--samples", type=int, default=10, help="requests per endpoint and mode")
+    parser.add_argument("--endpoints", nargs="*", help="subset of endpoint names")
+    args = parser.parse_args()
+
+    endpoints = [e for e in ENDPOINTS if not args.endpoints or e[0] in args.endpoints]
+    api = Client(timeout=60, max_connections=1)
+
+    print("🗜️  COMPRESSION & CONDITIONAL GET BENCHMARK")
+    print(f"API Base: {api.transport.base_url}")
+    print("=" * 78)
+    print(f"{'endpoint':<18}{'mode':<14}{'status':>8}{'bytes':>12}{'ms':>10}{'saved':>10}")
+
+    ok = True
+    for name, path in endpoints:
+        # Warm the route (and any upstream cache) so every mode sees the same content
+        r = api.request("GET", path, headers={"Accept-Encoding": "identity"})
+        if r.status_code == 200 and recently_modified(r.headers):
+            # Content changed within the last second: its real Last-Modified is only sent once that second is over
+            time.sleep(1.1)
+            r = api.request("GET", path, headers={"Accept-Encoding": "identity"})
+        if r.status_code != 200:
+            print(f"{name:<18}{'-':<14}{r.status_code:>8}  skipped")
+            continue
+        etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+
+        modes = [
+            ("identity", {"Accept-Encoding": "identity"}),
+            ("gzip", {"Accept-Encoding": "gzip"}),
+            ("br", {"Accept-Encoding": "br"}),
+        ]
+        if etag:
+            modes.append(("if-none-match", {"Accept-Encoding": "identity", "If-None-Match": etag}))
+        if last_modified:
+            modes.append(("if-mod-since", {"Accept-Encoding": "identity", "If-Modified-Since": last_modified}))
+
+        baseline = None
+        for mode, mode_headers in modes:
+            result = run_mode(api, path, mode_headers, args.samples)
+            baseline = baseline or result["bytes"]
+            saved = 1 - result["bytes"] / baseline if baseline else 0
+            print(f"{name:<18}{mode:<14}{result['status']:>8}{result['bytes']:>12.0f}{result['ms']:>10.1f}{saved:>9.0%}")
+            if mode.startswith("if-") and result["status"] != "304":
+                ok = False
+        if not etag:
+            print(f"{name:<18}⚠️  no ETag returned")
+            ok = False
+
+    api.close()
+    print("\n" + "=" * 78)
+    if ok:
+        print("✅ All endpoints returned validators and answered revalidation with 304")
+    else:
+        print("⚠️  Some endpoints did not revalidate (content may have changed between requests)")
+    return ok
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+NDJSON Export/Import Round-Trip Benchmark
+Seeds synthetic sessions through POST /import, streams GET /export (plain and gzip),
+re-imports the dump and reports throughput plus server RSS while streaming.
+The seeded sessions are deleted again afterwards; the server needs ADMIN_TOKEN set
+and the same value in this script's environment.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+from ai_platform_client import Client, Timings
+
+# Bulk transfers wait on the database for minutes, not on Gemini
+TIMEOUT = (5.0, 3600)
+
+
+class RssSampler(threading.Thread):
+    """Polls /system/health in the background and keeps the peak RSS seen"""
+
+    def __init__(self, interval=0.25):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = 0
+        # Own connection, so sampling never queues behind the transfer being measured
+        self.api = Client(max_connections=1, timeout=5)
+        self.baseline = self._read()
+        self._done = threading.Event()
+
+    def _read(self):
+        try:
+            return self.api.health().get("rss", 0)
+        except (requests.RequestException, ValueError):
+            return 0
+
+    def run(self):
+        while not self._done.is_set():
+            self.peak = max(self.peak, self._read())
+            self._done.wait(self.interval)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self.api.close()
+        return max(0, self.peak - self.baseline)
+
+
+def synthetic_lines(count, message_kb, prefix, start=None):
+    """Generates the NDJSON dump lazily so seeding large databases stays cheap on the client too"""
+    yield json.dumps({"type": "meta", "version": 1}) + "\n"
+    filler = "lorem ipsum " * (message_kb * 1024 // 12 // 2 or 1)
+    start = start or datetime.now(timezone.utc) - timedelta(days=count // 100 + 1)
+    for i in range(count):
+        messages = [{"role": "user", "content": f"question {i} {filler}"},
+                    {"role": "assistant", "content": f"answer {i} {filler}"}]
+        yield json.dumps({"type": "ChatSession", "data": {
+            "id": f"{prefix}{i:08d}",
+            "title": f"Benchmark session {i}",
+            "messages": json.dumps(messages),
+            "model": "gemini-2.0-flash",
+            "timestamp": (start + timedelta(minutes=i)).isoformat(),
+            "usage": json.dumps({"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30}),
+        }}) + "\n"
+
+
+def encoded(lines):
+    for line in lines:
+        yield line.encode("utf-8")
+
+
+def timed_import(api, timings, body, gzip=False):
+    sampler = RssSampler()
+    sampler.start()
+    try:
+        result = api.import_data(body, gzip=gzip)
+    finally:
+        rss_delta = sampler.stop()
+    return result, timings.calls[-1].elapsed_ms / 1000, rss_delta
+
+
+def timed_export(api, timings, path, gzip, since=None):
+    sampler = RssSampler()
+    sampler.start()
+    try:
+        with open(path, "wb") as f:
+            api.export_data(f, since=since, gzip=gzip)
+    finally:
+        rss_delta = sampler.stop()
+    stats = timings.calls[-1]
+    return {"bytes": stats.bytes_received, "seconds": stats.elapsed_ms / 1000, "ttfb": stats.ttfb_ms / 1000,
+            "rss_delta": rss_delta}
+
+
+def count_records(path):
+    counts = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                kind = json.loads(line)["type"]
+                counts[kind] = counts.get(kind, 0) + 1
+    counts.pop("meta", None)
+    return counts
+
+
+def round_trip(api, timings, args, prefix):
+    mib = 2 ** 20
+    if prefix:
+        result, elapsed, rss = timed_import(api, timings, encoded(synthetic_lines(args.seed, args.message_kb, prefix)))
+        n = result["imported"]["ChatSession"]
+        print(f"Seed import:     {n} sessions in {elapsed:.2f}s ({n / elapsed:,.0f} rows/s), "
+              f"server RSS +{rss / mib:.1f} MiB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_path = os.path.join(tmp, "export.ndjson")
+        gzip_path = os.path.join(tmp, "export.ndjson.gz")
+
+        plain = timed_export(api, timings, plain_path, gzip=False)
+        counts = count_records(plain_path)
+        rows = sum(counts.values())
+        print(f"Export (plain):  {rows} rows, {plain['bytes'] / mib:.1f} MiB in {plain['seconds']:.2f}s "
+              f"(TTFB {plain['ttfb'] * 1000:.0f} ms, {rows / plain['seconds']:,.0f} rows/s), "
+              f"server RSS +{plain['rss_delta'] / mib:.1f} MiB")
+
+        gz = timed_export(api, timings, gzip_path, gzip=True)
+        ratio = plain["bytes"] / gz["bytes"] if gz["bytes"] else 0
+        print(f"Export (gzip):   {gz['bytes'] / mib:.1f} MiB ({ratio:.1f}x smaller) in {gz['seconds']:.2f}s, "
+              f"server RSS +{gz['rss_delta'] / mib:.1f} MiB")
+
+        if args.since:
+            inc = timed_export(api, timings, os.path.join(tmp, "incremental.ndjson"), gzip=False, since=args.since)
+            print(f"Export (since):  {inc['bytes'] / mib:.1f} MiB in {inc['seconds']:.2f}s")
+
+        with open(gzip_path, "rb") as f:
+            result, elapsed, rss = timed_import(api, timings, f, gzip=True)
+        reimported = sum(result["imported"].values())
+        print(f"Re-import:       {reimported} rows in {elapsed:.2f}s ({reimported / elapsed:,.0f} rows/s), "
+              f"server RSS +{rss / mib:.1f} MiB")
+
+    print("\n" + "=" * 60)
+    if reimported == rows and not result["errorCount"]:
+        print("✅ Round trip complete: every exported row was re-imported")
+        return True
+    print(f"❌ Round trip mismatch: exported {counts}, imported {result['imported']}, "
+          f"{result['errorCount']} errors")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--seed", type=int, default=5000, help="synthetic sessions to import first (0 to skip)")
+    parser.add_argument("--message-kb", type=int, default=4, help="approximate size of each seeded transcript")
+    parser.add_argument("--since", help="also time an incremental export from this ISO timestamp")
+    args = parser.parse_args()
+
+    timings = Timings()
+    api = Client(timeout=TIMEOUT, max_connections=1, hooks=[timings])
+
+    print("📦 NDJSON EXPORT/IMPORT ROUND-TRIP BENCHMARK")
+    print(f"API Base: {api.transport.base_url}")
+    print("=" * 60)
+
+    prefix = f"bench-{uuid.uuid4().hex[:8]}-" if args.seed else None
+    try:
+        return round_trip(api, timings, args, prefix)
+    finally:
+        if prefix:
+            print(f"Cleanup:         removed {api.delete_sessions(prefix)} seeded sessions")
+        api.close()
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -3,38 +3,38 @@
 Specific File Upload Testing
 """
 
-import requests
 import os
 from io import BytesIO
 
+from ai_platform_client import ApiError, Client, MultipartStream
+
 BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
 API_BASE = f"{BASE_URL}/api"
 
+api = Client(API_BASE)
+
 def test_single_file_upload():
     """Test that only single file uploads are accepted"""
     print("=== Testing Single File Upload Restriction ===")
-    
+
     # Test single file (should work)
     try:
-        files = {
-            'file': ('test.txt', BytesIO(b'Single file content'), 'text/plain')
-        }
-        response = requests.post(f"{API_BASE}/files/analyze", files=files)
-        print(f"Single file - Status: {response.status_code}")
-        if response.status_code == 200:
-            print("✅ Single file upload works")
-        else:
-            print(f"❌ Single file upload failed: {response.text}")
+        api.analyze_file(BytesIO(b'Single file content'), 'test.txt', 'text/plain')
+        print("Single file - Status: 200")
+        print("✅ Single file upload works")
+    except ApiError as e:
+        print(f"Single file - Status: {e.status}")
+        print(f"❌ Single file upload failed: {e.message}")
     except Exception as e:
         print(f"Single file error: {e}")
-    
+
     # Test multiple files (current implementation will only process the first one)
     try:
-        files = [
+        body = MultipartStream(files=[
             ('file', ('test1.txt', BytesIO(b'First file content'), 'text/plain')),
             ('file', ('test2.txt', BytesIO(b'Second file content'), 'text/plain'))
-        ]
-        response = requests.post(f"{API_BASE}/files/analyze", files=files)
+        ])
+        response = api.request("POST", "/files/analyze", data=body, headers=body.headers)
         print(f"Multiple files - Status: {response.status_code}")
         if response.status_code == 200:
             data = response.json()
@@ -48,7 +48,7 @@ def test_single_file_upload():
 def test_file_types():
     """Test different file types"""
     print("\n=== Testing File Type Support ===")
-    
+
     file_types = [
         ('test.txt', 'text/plain', 'Text file content'),
         ('test.csv', 'text/csv', 'name,age\nJohn,25'),
@@ -56,56 +56,56 @@ def test_file_types():
         ('test.json', 'application/json', '{"key": "value"}'),
         ('test.doc', 'application/msword', 'Word document content')
     ]
-    
-    for filename, content_type, content in file_types:
-        try:
-            files = {
-                'file': (filename, BytesIO(content.encode('utf-8')), content_type)
-            }
-            response = requests.post(f"{API_BASE}/files/analyze", files=files)
-            print(f"{filename} ({content_type}) - Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"  ✅ Processed: {data.get('wordCount')} words, {data.get('charCount')} chars")
-            else:
-                print(f"  ❌ Failed: {response.text}")
-                
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
+
+    # Uploaded concurrently over the shared connection pool
+    def upload(entry):
+        filename, content_type, content = entry
+        return api.analyze_file(content.encode('utf-8'), filename, content_type)
+
+    results = api.batch(upload, file_types, return_exceptions=True)
+
+    for (filename, content_type, content), result in zip(file_types, results):
+        if isinstance(result, ApiError):
+            print(f"{filename} ({content_type}) - Status: {result.status}")
+            print(f"  ❌ Failed: {result.message}")
+        elif isinstance(result, Exception):
+            print(f"  ❌ Error: {result}")
+        else:
+            print(f"{filename} ({content_type}) - Status: 200")
+            print(f"  ✅ Processed: {result.get('wordCount')} words, {result.get('charCount')} chars")
 
 def test_missing_file_scenarios():
     """Test various missing file scenarios"""
     print("\n=== Testing Missing File Scenarios ===")
-    
+
     # Test 1: No form data at all
     try:
-        response = requests.post(f"{API_BASE}/files/analyze")
+        response = api.request("POST", "/files/analyze")
         print(f"No form data - Status: {response.status_code}")
         print(f"Response: {response.text}")
     except Exception as e:
         print(f"No form data error: {e}")
-    
+
     # Test 2: Empty form data
     try:
-        response = requests.post(f"{API_BASE}/files/analyze", files={})
+        body = MultipartStream()
+        response = api.request("POST", "/files/analyze", data=body, headers=body.headers)
         print(f"Empty form data - Status: {response.status_code}")
         print(f"Response: {response.text}")
     except Exception as e:
         print(f"Empty form data error: {e}")
-    
+
     # Test 3: Form data with wrong field name
     try:
-        files = {
-            'wrong_field': ('test.txt', BytesIO(b'content'), 'text/plain')
-        }
-        response = requests.post(f"{API_BASE}/files/analyze", files=files)
-        print(f"Wrong field name - Status: {response.status_code}")
-        print(f"Response: {response.text}")
+        api.analyze_file(BytesIO(b'content'), 'test.txt', 'text/plain', field='wrong_field')
+        print("Wrong field name - Status: 200")
+    except ApiError as e:
+        print(f"Wrong field name - Status: {e.status}")
+        print(f"Response: {e.body}")
     except Exception as e:
         print(f"Wrong field name error: {e}")
 
 if __name__ == "__main__":
     test_single_file_upload()
     test_file_types()
-    test_missing_file_scenarios()
\ No newline at end of file
+    test_missing_file_scenarios()
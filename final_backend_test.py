@@ -3,10 +3,10 @@
 Final Comprehensive Backend API Test Summary
 """
 
-import requests
 import json
 import os
-from io import BytesIO
+
+from ai_platform_client import ApiError, Client, Timings
 
 BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
 API_BASE = f"{BASE_URL}/api"
@@ -14,161 +14,138 @@ API_BASE = f"{BASE_URL}/api"
 def main():
     print("🔍 FINAL BACKEND API VERIFICATION")
     print("="*50)
-    
+
+    timings = Timings()
+    api = Client(API_BASE, hooks=[timings])
     results = {}
-    
+
     # Test 1: All 8 core endpoints
     print("\n1. CORE API ENDPOINTS:")
     endpoints = [
-        ("GET", "/", "Root endpoint"),
-        ("POST", "/chat/completions", "Chat completions"),
-        ("GET", "/chat/sessions", "Chat sessions"),
-        ("GET", "/settings", "Settings GET"),
-        ("POST", "/settings", "Settings POST"),
-        ("GET", "/system/usage", "System usage"),
-        ("POST", "/files/analyze", "File analysis"),
-        ("GET", "/news/latest", "News endpoint"),
-        ("GET", "/companies/search", "Companies search")
+        ("Root endpoint", lambda: api.root()),
+        ("Chat completions", lambda: api.chat([{"role": "user", "content": "test"}])),
+        ("Chat sessions", lambda: api.list_sessions()),
+        ("Settings GET", lambda: api.get_settings()),
+        ("Settings POST", lambda: api.update_settings({"mode": "test"})),
+        ("System usage", lambda: api.usage()),
+        ("File analysis", lambda: api.analyze_file(b'test', 'test.txt', 'text/plain')),
+        ("News endpoint", lambda: api.latest_news()),
+        ("Companies search", lambda: api.search_companies(""))
     ]
-    
-    for method, endpoint, name in endpoints:
-        try:
-            if method == "GET":
-                response = requests.get(f"{API_BASE}{endpoint}")
-            elif method == "POST":
-                if endpoint == "/chat/completions":
-                    payload = {"messages": [{"role": "user", "content": "test"}]}
-                    response = requests.post(f"{API_BASE}{endpoint}", json=payload)
-                elif endpoint == "/settings":
-                    payload = {"mode": "test"}
-                    response = requests.post(f"{API_BASE}{endpoint}", json=payload)
-                elif endpoint == "/files/analyze":
-                    files = {'file': ('test.txt', BytesIO(b'test'), 'text/plain')}
-                    response = requests.post(f"{API_BASE}{endpoint}", files=files)
-            
-            if response.status_code in [200, 201]:
-                print(f"  ✅ {name}")
-                results[name] = True
-            else:
-                print(f"  ❌ {name} - Status: {response.status_code}")
-                results[name] = False
-                
-        except Exception as e:
-            print(f"  ❌ {name} - Error: {e}")
+
+    outcomes = api.batch(lambda entry: entry[1](), endpoints, return_exceptions=True)
+
+    for (name, _), outcome in zip(endpoints, outcomes):
+        if isinstance(outcome, ApiError):
+            print(f"  ❌ {name} - Status: {outcome.status}")
             results[name] = False
-    
+        elif isinstance(outcome, Exception):
+            print(f"  ❌ {name} - Error: {outcome}")
+            results[name] = False
+        else:
+            print(f"  ✅ {name}")
+            results[name] = True
+
     # Test 2: JSON Response Validation
     print("\n2. JSON RESPONSE VALIDATION:")
     json_valid = True
     test_endpoints = ["/", "/chat/sessions", "/settings", "/system/usage", "/news/latest"]
-    
+
     for endpoint in test_endpoints:
         try:
-            response = requests.get(f"{API_BASE}{endpoint}")
+            response = api.request("GET", endpoint)
             response.json()  # This will raise JSONDecodeError if invalid
         except json.JSONDecodeError:
             json_valid = False
             break
         except Exception:
             pass
-    
+
     if json_valid:
         print("  ✅ All endpoints return valid JSON")
         results["JSON Validation"] = True
     else:
         print("  ❌ JSON parsing errors found")
         results["JSON Validation"] = False
-    
+
     # Test 3: File Upload Validation
     print("\n3. FILE UPLOAD VALIDATION:")
-    
+
     # Single file upload
     try:
-        files = {'file': ('test.txt', BytesIO(b'test content'), 'text/plain')}
-        response = requests.post(f"{API_BASE}/files/analyze", files=files)
-        single_file_ok = response.status_code == 200
-    except:
+        api.analyze_file(b'test content', 'test.txt', 'text/plain')
+        single_file_ok = True
+    except Exception:
         single_file_ok = False
-    
+
     # Multiple file types
-    file_types_ok = True
-    for ext, mime in [('txt', 'text/plain'), ('csv', 'text/csv'), ('pdf', 'application/pdf')]:
-        try:
-            files = {'file': (f'test.{ext}', BytesIO(b'content'), mime)}
-            response = requests.post(f"{API_BASE}/files/analyze", files=files)
-            if response.status_code != 200:
-                file_types_ok = False
-                break
-        except:
-            file_types_ok = False
-            break
-    
+    file_types = [('txt', 'text/plain'), ('csv', 'text/csv'), ('pdf', 'application/pdf')]
+    uploads = api.batch(lambda t: api.analyze_file(b'content', f'test.{t[0]}', t[1]), file_types,
+                        return_exceptions=True)
+    file_types_ok = not any(isinstance(u, Exception) for u in uploads)
+
     if single_file_ok and file_types_ok:
         print("  ✅ File upload working (single file, multiple types supported)")
         results["File Upload"] = True
     else:
         print("  ❌ File upload issues found")
         results["File Upload"] = False
-    
+
     # Test 4: Error Handling
     print("\n4. ERROR HANDLING:")
-    
+
     # Invalid chat request
     try:
-        payload = {"messages": "invalid"}
-        response = requests.post(f"{API_BASE}/chat/completions", json=payload)
+        response = api.request("POST", "/chat/completions", json={"messages": "invalid"})
         error_handling_ok = response.status_code == 400
-    except:
+    except Exception:
         error_handling_ok = False
-    
+
     # Non-existent route
     try:
-        response = requests.get(f"{API_BASE}/nonexistent")
+        response = api.request("GET", "/nonexistent")
         error_handling_ok = error_handling_ok and response.status_code == 404
-    except:
+    except Exception:
         error_handling_ok = False
-    
+
     if error_handling_ok:
         print("  ✅ Error handling working correctly")
         results["Error Handling"] = True
     else:
         print("  ❌ Error handling issues found")
         results["Error Handling"] = False
-    
+
     # Test 5: Gemini API Integration
     print("\n5. GEMINI API INTEGRATION:")
     try:
-        payload = {"messages": [{"role": "user", "content": "Hello"}]}
-        response = requests.post(f"{API_BASE}/chat/completions", json=payload)
-        if response.status_code == 200:
-            data = response.json()
-            gemini_ok = 'choices' in data and len(data['choices']) > 0
-        else:
-            gemini_ok = False
-    except:
+        data = api.chat([{"role": "user", "content": "Hello"}])
+        gemini_ok = 'choices' in data and len(data['choices']) > 0
+    except Exception:
         gemini_ok = False
-    
+
     if gemini_ok:
         print("  ✅ Gemini API integration working")
         results["Gemini Integration"] = True
     else:
         print("  ❌ Gemini API integration issues")
         results["Gemini Integration"] = False
-    
+
     # Summary
     print("\n" + "="*50)
     print("📊 FINAL SUMMARY:")
     print("="*50)
-    
+
     passed = sum(results.values())
     total = len(results)
-    
+
     for test, result in results.items():
         status = "✅ PASSED" if result else "❌ FAILED"
         print(f"{test}: {status}")
-    
+
     print(f"\nOverall: {passed}/{total} tests passed")
-    
+    print("\n" + timings.table())
+    api.close()
+
     if passed == total:
         print("🎉 ALL BACKEND TESTS PASSED!")
         print("✅ No JSON parsing errors found")
@@ -180,4 +157,4 @@ def main():
         return False
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
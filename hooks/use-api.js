@@ -2,8 +2,117 @@
 
 import { useState, useEffect, useCallback, useRef } from 'react'
 
-// Cache for API results
+// Response cache: LRU-bounded, per-entry TTL with a stale-while-revalidate window
+const CACHE_MAX_ENTRIES = 100
+const DEFAULT_TTL = 5 * 60 * 1000
+const DEFAULT_STALE_TTL = 30 * 60 * 1000
+
 const apiCache = new Map()
+// Identical requests that are already on the wire share one entry: { promise, invalidated }
+const inFlight = new Map()
+
+// Request headers (Authorization, X-Timezone, ...) can change the response, so they are part of the key
+function cacheKey(url, options) {
+  const method = (options.method || 'GET').toUpperCase()
+  const headers = [...new Headers(options.headers || {}).entries()].sort(([a], [b]) => (a < b ? -1 : 1))
+  const parts = [method, url]
+  if (headers.length) parts.push(JSON.stringify(headers))
+  if (typeof options.body === 'string') parts.push(options.body)
+  return parts.join(' ')
+}
+
+function cacheGet(key) {
+  const entry = apiCache.get(key)
+  if (!entry) return null
+  const age = Date.now() - entry.timestamp
+  if (age >= entry.ttl + entry.staleTtl) {
+    apiCache.delete(key)
+    return null
+  }
+  // Re-insert to mark as most recently used
+  apiCache.delete(key)
+  apiCache.set(key, entry)
+  return { data: entry.data, stale: age >= entry.ttl }
+}
+
+function cacheSet(key, data, ttl, staleTtl) {
+  apiCache.delete(key)
+  apiCache.set(key, { data, timestamp: Date.now(), ttl, staleTtl })
+  while (apiCache.size > CACHE_MAX_ENTRIES) {
+    apiCache.delete(apiCache.keys().next().value)
+  }
+}
+
+function resourcePath(url) {
+  return url.split(/[?#]/)[0].replace(/\/+$/, '')
+}
+
+// Drops cached GETs for a resource, its parent collection and anything below it,
+// e.g. PATCH /api/chat/sessions/1 invalidates /api/chat/sessions and /api/chat/sessions/1.
+// Matching requests still on the wire are detached too, so their pre-mutation
+// response never lands in the cache and later callers start a fresh fetch.
+export function invalidateApiCache(url) {
+  const path = resourcePath(url)
+  const parent = path.slice(0, path.lastIndexOf('/'))
+  const affected = key => {
+    const keyPath = resourcePath(key.split(' ')[1])
+    return keyPath === path || keyPath === parent || keyPath.startsWith(`${path}/`)
+  }
+  for (const key of [...apiCache.keys()]) {
+    if (affected(key)) apiCache.delete(key)
+  }
+  for (const [key, entry] of [...inFlight.entries()]) {
+    if (!affected(key)) continue
+    entry.invalidated = true
+    inFlight.delete(key)
+  }
+}
+
+async function fetchJson(url, options, retries, signal) {
+  const response = await retryWithBackoff(
+    async () => {
+      const res = await fetch(url, {
+        ...options,
+        signal,
+        headers: {
+          'Content-Type': 'application/json',
+          ...options.headers
+        }
+      })
+
+      if (!res.ok) {
+        const error = new Error(`HTTP error! status: ${res.status}`)
+        error.status = res.status
+        error.response = res
+        throw error
+      }
+
+      return res
+    },
+    retries
+  )
+  return response.json()
+}
+
+// Shared network fetch that fills the cache; concurrent callers for the same key reuse it.
+// `force` never joins an existing request and supersedes it, so its older result is not cached.
+function fetchShared(key, url, options, retries, ttl, staleTtl, force = false) {
+  const current = inFlight.get(key)
+  if (current && !force) return current.promise
+  if (current) current.invalidated = true
+
+  const entry = { invalidated: false }
+  entry.promise = fetchJson(url, options, retries)
+    .then(result => {
+      if (!entry.invalidated) cacheSet(key, result, ttl, staleTtl)
+      return result
+    })
+    .finally(() => {
+      if (inFlight.get(key) === entry) inFlight.delete(key)
+    })
+  inFlight.set(key, entry)
+  return entry.promise
+}
 
 // Debounce utility
 function debounce(func, wait) {
@@ -57,10 +166,12 @@ export function useApi(url, options = {}) {
     immediate = true,
     cache = true,
     retries = 3,
+    ttl = DEFAULT_TTL,
+    staleTtl = DEFAULT_STALE_TTL,
     ...fetchOptions
   } = options
 
-  const fetchData = useCallback(async (customUrl, customOptions = {}) => {
+  const fetchData = useCallback(async (customUrl, customOptions = {}, { force = false } = {}) => {
     const finalUrl = customUrl || url
     const finalOptions = { ...fetchOptions, ...customOptions }
     
@@ -72,65 +183,43 @@ export function useApi(url, options = {}) {
     }
 
     // Create new abort controller
-    abortControllerRef.current = new AbortController()
+    const controller = new AbortController()
+    abortControllerRef.current = controller
+
+    const method = (finalOptions.method || 'GET').toUpperCase()
+    const cacheable = cache && (method === 'GET' || method === 'HEAD')
+    const key = cacheable ? cacheKey(finalUrl, finalOptions) : null
     
     setLoading(true)
     setError(null)
 
     try {
-      // Check cache first
-      const cacheKey = JSON.stringify({ url: finalUrl, options: finalOptions })
-      if (cache && apiCache.has(cacheKey)) {
-        const cachedData = apiCache.get(cacheKey)
-        // Check if cache is still valid (5 minutes)
-        if (Date.now() - cachedData.timestamp < 5 * 60 * 1000) {
-          setData(cachedData.data)
+      if (cacheable && !force) {
+        const cached = cacheGet(key)
+        if (cached) {
+          setData(cached.data)
           setLoading(false)
-          return cachedData.data
-        } else {
-          apiCache.delete(cacheKey)
+          if (cached.stale) {
+            // Serve the stale copy now and refresh it in the background
+            fetchShared(key, finalUrl, finalOptions, retries, ttl, staleTtl)
+              .then(result => { if (!controller.signal.aborted) setData(result) })
+              .catch(() => { })
+          }
+          return cached.data
         }
       }
 
-      const response = await retryWithBackoff(
-        async () => {
-          const res = await fetch(finalUrl, {
-            ...finalOptions,
-            signal: abortControllerRef.current.signal,
-            headers: {
-              'Content-Type': 'application/json',
-              ...finalOptions.headers
-            }
-          })
-          
-          if (!res.ok) {
-            const error = new Error(`HTTP error! status: ${res.status}`)
-            error.status = res.status
-            error.response = res
-            throw error
-          }
-          
-          return res
-        },
-        retries
-      )
+      // Shared requests are not tied to this hook's signal, so aborting only detaches it
+      const result = cacheable
+        ? await fetchShared(key, finalUrl, finalOptions, retries, ttl, staleTtl, force)
+        : await fetchJson(finalUrl, finalOptions, retries, controller.signal)
+      if (controller.signal.aborted) return
 
-      const result = await response.json()
-      
-      // Cache the result
-      if (cache) {
-        const cacheKey = JSON.stringify({ url: finalUrl, options: finalOptions })
-        apiCache.set(cacheKey, {
-          data: result,
-          timestamp: Date.now()
-        })
-      }
-      
       setData(result)
       return result
       
     } catch (err) {
-      if (err.name === 'AbortError') {
+      if (err.name === 'AbortError' || controller.signal.aborted) {
         // Request was aborted, don't update state
         return
       }
@@ -139,12 +228,12 @@ export function useApi(url, options = {}) {
       setError(err)
       throw err
     } finally {
-      setLoading(false)
+      if (!controller.signal.aborted) setLoading(false)
     }
-  }, [url, cache, retries, JSON.stringify(fetchOptions)])
+  }, [url, cache, retries, ttl, staleTtl, JSON.stringify(fetchOptions)])
 
   const refetch = useCallback(() => {
-    return fetchData()
+    return fetchData(undefined, {}, { force: true })
   }, [fetchData])
 
   useEffect(() => {
@@ -201,6 +290,7 @@ export function useApiMutation() {
       )
 
       const result = await response.json()
+      invalidateApiCache(url)
       return result
       
     } catch (err) {
@@ -0,0 +1,8 @@
+export async function register() {
+    if (process.env.NEXT_RUNTIME === 'nodejs') {
+        const { startWarmup } = await import('./lib/api/warmup')
+        const { startCompaction } = await import('./lib/api/compaction')
+        startWarmup()
+        startCompaction()
+    }
+}
@@ -0,0 +1,81 @@
+import { gzipSync, gunzipSync } from 'zlib'
+import { markChanged } from './db'
+
+// Per model: which heavy columns move into the Archive table, what the stub keeps
+// in their place, and the column that decides a row's age. A restore counts as an
+// access, so `restoredAt` keeps a reopened row out of the archive for another period.
+export const ARCHIVABLE = {
+    ChatSession: { delegate: 'chatSession', fields: ['messages'], stub: { messages: '[]' }, age: 'timestamp' },
+    FileAnalysis: { delegate: 'fileAnalysis', fields: ['summary'], stub: { summary: '' }, age: 'uploadedAt' }
+}
+
+function pack(kind, row) {
+    const body = Object.fromEntries(ARCHIVABLE[kind].fields.map(f => [f, row[f]]))
+    return gzipSync(JSON.stringify(body))
+}
+
+function unpack(payload) {
+    return JSON.parse(gunzipSync(Buffer.from(payload)).toString('utf-8'))
+}
+
+// Moves one batch of rows older than `cutoff` (and, if given, with ids starting with `idPrefix`)
+// into the archive; returns how many were archived.
+// The stub is only written if the row is unchanged since it was read and packed, so a
+// completion or import landing in between is never replaced by the old body.
+export async function archiveBatch(prisma, kind, cutoff, { batch = 200, idPrefix } = {}) {
+    const { delegate, fields, stub, age } = ARCHIVABLE[kind]
+    const stale = { archived: false, [age]: { lt: cutoff }, OR: [{ restoredAt: null }, { restoredAt: { lt: cutoff } }] }
+    if (idPrefix) stale.id = { startsWith: idPrefix }
+    const rows = await prisma[delegate].findMany({ where: stale, take: batch })
+    if (!rows.length) return 0
+    const archived = await prisma.$transaction(async (tx) => {
+        let n = 0
+        for (const row of rows) {
+            const unchanged = Object.fromEntries(fields.map(f => [f, row[f]]))
+            const { count } = await tx[delegate].updateMany({
+                where: { id: row.id, ...stale, ...unchanged },
+                data: { ...stub, archived: true }
+            })
+            if (!count) continue
+            await tx.archive.upsert({
+                where: { kind_recordId: { kind, recordId: row.id } },
+                create: { kind, recordId: row.id, payload: pack(kind, row) },
+                update: { payload: pack(kind, row), archivedAt: new Date() }
+            })
+            n++
+        }
+        return n
+    })
+    if (archived) markChanged(kind)
+    return archived
+}
+
+// Brings an archived row back into its table and drops the archive entry. Safe to race:
+// a caller that finds the entry already gone gets the row as the winning restore left it.
+// The age column is left alone so listings keep their order.
+export async function restore(prisma, kind, row) {
+    if (!row?.archived) return row
+    const { delegate } = ARCHIVABLE[kind]
+    const entry = await prisma.archive.findUnique({ where: { kind_recordId: { kind, recordId: row.id } } })
+    if (!entry) return prisma[delegate].findUnique({ where: { id: row.id } })
+    const [, , restored] = await prisma.$transaction([
+        prisma[delegate].updateMany({ where: { id: row.id, archived: true }, data: { ...unpack(entry.payload), archived: false, restoredAt: new Date() } }),
+        prisma.archive.deleteMany({ where: { kind, recordId: row.id } }),
+        prisma[delegate].findUnique({ where: { id: row.id } })
+    ])
+    markChanged(kind)
+    return restored
+}
+
+// Fills archived rows from their payloads in memory, leaving the database untouched (used by /export)
+export async function hydrate(prisma, kind, rows) {
+    const ids = rows.filter(r => r.archived).map(r => r.id)
+    if (!ids.length) return rows
+    const entries = await prisma.archive.findMany({ where: { kind, recordId: { in: ids } } })
+    const bodies = new Map(entries.map(e => [e.recordId, unpack(e.payload)]))
+    return rows.map(r => (bodies.has(r.id) ? { ...r, ...bodies.get(r.id), archived: false } : r))
+}
+
+export function dropArchived(prisma, kind, ids) {
+    return prisma.archive.deleteMany({ where: { kind, recordId: { in: ids } } })
+}
@@ -0,0 +1,34 @@
+// Process-local cache for upstream lookups (news headlines, company profiles).
+// Entries remember when they were fetched so routes can decide freshness and the
+// warm-up scheduler can report it. Concurrent loads of the same key share a promise.
+// State lives on globalThis because instrumentation.js and the route handlers are
+// bundled separately and would otherwise each get their own copy of this module.
+const MAX_ENTRIES = 500
+
+const store = globalThis.__upstreamCache ??= { entries: new Map(), pending: new Map() }
+const { entries, pending } = store
+
+export function peek(key) {
+    return entries.get(key) || null
+}
+
+export function refresh(key, load) {
+    if (pending.has(key)) return pending.get(key)
+    const promise = Promise.resolve()
+        .then(load)
+        .then(value => {
+            entries.delete(key)
+            entries.set(key, { value, fetchedAt: Date.now() })
+            while (entries.size > MAX_ENTRIES) entries.delete(entries.keys().next().value)
+            return value
+        })
+        .finally(() => pending.delete(key))
+    pending.set(key, promise)
+    return promise
+}
+
+export async function cached(key, maxAge, load) {
+    const hit = entries.get(key)
+    if (hit && Date.now() - hit.fetchedAt < maxAge) return hit.value
+    return refresh(key, load)
+}
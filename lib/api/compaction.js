@@ -0,0 +1,108 @@
+import { getPrisma } from './db'
+import { ARCHIVABLE, archiveBatch } from './archive'
+
+// Retention: rows untouched for longer than the configured number of days are
+// archived into compressed storage by a periodic job, followed by VACUUM.
+const DAY = 24 * 3600 * 1000
+
+export const COMPACTION_CONFIG = {
+    enabled: process.env.COMPACTION_ENABLED ? process.env.COMPACTION_ENABLED === 'true' : process.env.NODE_ENV === 'production',
+    sessionDays: Number(process.env.RETENTION_SESSION_DAYS || 90),
+    fileDays: Number(process.env.RETENTION_FILE_DAYS || 180),
+    interval: Number(process.env.COMPACTION_INTERVAL_MS || 6 * 3600 * 1000),
+    vacuumInterval: Number(process.env.VACUUM_INTERVAL_MS || DAY)
+}
+
+// Shared with the route bundles, see lib/api/cache.js
+const state = globalThis.__compactionState ??= {
+    started: false,
+    running: null,
+    lastRun: null,
+    lastVacuumAt: null,
+    nextRunAt: null
+}
+
+async function vacuum(prisma) {
+    await prisma.$executeRawUnsafe('VACUUM')
+    state.lastVacuumAt = Date.now()
+}
+
+async function compact({ sessionDays, fileDays, vacuum: forceVacuum, idPrefix }) {
+    const prisma = await getPrisma()
+    const started = Date.now()
+    const days = { ChatSession: sessionDays, FileAnalysis: fileDays }
+    const archived = {}
+    for (const kind of Object.keys(ARCHIVABLE)) {
+        archived[kind] = 0
+        if (!(days[kind] >= 0)) continue
+        const cutoff = new Date(started - days[kind] * DAY)
+        let n
+        while ((n = await archiveBatch(prisma, kind, cutoff, { idPrefix })) > 0) archived[kind] += n
+    }
+    const dueVacuum = !state.lastVacuumAt || started - state.lastVacuumAt >= COMPACTION_CONFIG.vacuumInterval
+    const vacuumed = forceVacuum ?? dueVacuum
+    if (vacuumed) await vacuum(prisma)
+    state.lastRun = { at: new Date(started).toISOString(), durationMs: Date.now() - started, archived, vacuumed, error: null }
+    return state.lastRun
+}
+
+// Runs are serialized; a request that arrives mid-run waits for the current one
+export async function runCompaction(opts = {}) {
+    while (state.running) await state.running.catch(() => { })
+    const run = compact({
+        sessionDays: opts.sessionDays ?? COMPACTION_CONFIG.sessionDays,
+        fileDays: opts.fileDays ?? COMPACTION_CONFIG.fileDays,
+        vacuum: opts.vacuum,
+        idPrefix: opts.idPrefix
+    })
+    state.running = run
+    try {
+        return await run
+    } catch (e) {
+        state.lastRun = { at: new Date().toISOString(), error: String(e?.message || e) }
+        throw e
+    } finally {
+        state.running = null
+    }
+}
+
+export function startCompaction() {
+    if (state.started || !COMPACTION_CONFIG.enabled) return
+    state.started = true
+    const plan = (delay) => {
+        state.nextRunAt = Date.now() + delay
+        const t = setTimeout(async () => {
+            try {
+                await runCompaction()
+            } catch (e) {
+                console.error('Compaction failed:', e)
+            }
+            plan(COMPACTION_CONFIG.interval)
+        }, delay)
+        t.unref?.()
+    }
+    // First pass shortly after boot, off the startup path
+    plan(60 * 1000)
+}
+
+export async function compactionStatus() {
+    const prisma = await getPrisma()
+    const [sessions, archivedSessions, files, archivedFiles] = await Promise.all([
+        prisma.chatSession.count(),
+        prisma.chatSession.count({ where: { archived: true } }),
+        prisma.fileAnalysis.count(),
+        prisma.fileAnalysis.count({ where: { archived: true } })
+    ])
+    return {
+        ...COMPACTION_CONFIG,
+        started: state.started,
+        running: !!state.running,
+        lastRun: state.lastRun,
+        lastVacuumAt: state.lastVacuumAt ? new Date(state.lastVacuumAt).toISOString() : null,
+        nextRunAt: state.nextRunAt ? new Date(state.nextRunAt).toISOString() : null,
+        rows: {
+            ChatSession: { total: sessions, archived: archivedSessions },
+            FileAnalysis: { total: files, archived: archivedFiles }
+        }
+    }
+}
@@ -0,0 +1,24 @@
+// Prisma is only loaded by routes that touch the database, so GET / and the
+// news/company proxies never pay for the query engine on a cold start. The
+// client is kept on globalThis so background jobs started from instrumentation.js
+// share it with the route handlers.
+export function getPrisma() {
+    if (!globalThis.__prismaPromise) {
+        globalThis.__prismaPromise = import('@prisma/client').then(({ PrismaClient }) => new PrismaClient())
+    }
+    return globalThis.__prismaPromise
+}
+
+// Time of the last write that does not bump a row's own timestamp (rename, delete,
+// archive, import), folded into Last-Modified so validators stay honest. Starts at
+// boot so a restart never produces a false 304.
+const changedAt = globalThis.__tableChangedAt ??= {}
+const BOOTED_AT = Date.now()
+
+export function markChanged(kind) {
+    changedAt[kind] = Date.now()
+}
+
+export function lastChanged(kind) {
+    return changedAt[kind] || BOOTED_AT
+}
@@ -0,0 +1,96 @@
+// Gemini REST client shared by the chat and file routes
+
+const GEMINI_URL = 'https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash'
+
+function geminiBody(msgs, opts = {}) {
+    const body = {
+        contents: msgs.map(m => ({
+            parts: [{ text: m.content }],
+            role: m.role === 'assistant' ? 'model' : 'user'
+        })),
+        generationConfig: {
+            temperature: opts.temperature ?? 0.7,
+            maxOutputTokens: opts.maxTokens ?? 1000,
+            candidateCount: 1
+        }
+    }
+    if (opts.system) body.systemInstruction = { parts: [{ text: opts.system }] }
+    return body
+}
+
+// POST to Gemini with the same 503/overload backoff for both unary and streamed calls
+async function geminiFetch(url, body, signal) {
+    for (let i = 0; i < 3; i++) {
+        try {
+            const r = await fetch(url, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-goog-api-key': process.env.GEMINI_API_KEY
+                },
+                body: JSON.stringify(body),
+                signal
+            })
+            if (!r.ok) {
+                const t = await r.text()
+                if ((r.status === 503 || /unavailable|overload/i.test(t)) && i < 2) {
+                    await new Promise(d => setTimeout(d, 600 * (i + 1)))
+                    continue
+                }
+                throw new Error(t)
+            }
+            return r
+        } catch (e) {
+            if (i === 2 || e.name === 'AbortError') throw e
+            await new Promise(d => setTimeout(d, 600 * (i + 1)))
+        }
+    }
+}
+
+export async function callGeminiAPI(msgs, opts = {}) {
+    const r = await geminiFetch(`${GEMINI_URL}:generateContent`, geminiBody(msgs, opts))
+    const data = await r.json()
+    const part = data.candidates?.[0]?.content?.parts?.[0]?.text
+    if (!part) throw new Error('Invalid Gemini response')
+    return { content: part, usage: { prompt_tokens: 0, completion_tokens: 0, total_tokens: 0 } }
+}
+
+// Streams a completion over SSE. `opts.abortIf(text)` is consulted until the first
+// `opts.checkChars` characters have arrived; returning true cancels the generation.
+export async function streamGeminiAPI(msgs, opts = {}) {
+    const controller = new AbortController()
+    const r = await geminiFetch(`${GEMINI_URL}:streamGenerateContent?alt=sse`, geminiBody(msgs, opts), controller.signal)
+    const reader = r.body.getReader()
+    const decoder = new TextDecoder()
+    const checkChars = opts.checkChars ?? 240
+    let buf = ''
+    let content = ''
+    let watching = typeof opts.abortIf === 'function'
+    try {
+        while (true) {
+            const { done, value } = await reader.read()
+            if (done) break
+            buf += decoder.decode(value, { stream: true })
+            const lines = buf.split('\n')
+            buf = lines.pop()
+            for (const line of lines) {
+                if (!line.startsWith('data:')) continue
+                try {
+                    const chunk = JSON.parse(line.slice(5))
+                    content += chunk.candidates?.[0]?.content?.parts?.map(p => p.text || '').join('') || ''
+                } catch { }
+            }
+            if (watching && content) {
+                if (opts.abortIf(content.slice(0, checkChars))) {
+                    controller.abort()
+                    return { content, aborted: true, usage: { prompt_tokens: 0, completion_tokens: 0, total_tokens: 0 } }
+                }
+                watching = content.length < checkChars
+            }
+        }
+    } finally {
+        reader.releaseLock()
+    }
+    if (!content) throw new Error('Invalid Gemini response')
+    return { content, aborted: false, usage: { prompt_tokens: 0, completion_tokens: 0, total_tokens: 0 } }
+}
@@ -0,0 +1,99 @@
+import { createHash, timingSafeEqual } from 'crypto'
+import { brotliCompressSync, gzipSync, constants as zlibConstants } from 'zlib'
+import { NextResponse } from 'next/server'
+
+const COMPRESS_MIN_BYTES = Number(process.env.COMPRESS_MIN_BYTES || 1024)
+
+export function cors(res) {
+    res.headers.set('Access-Control-Allow-Origin', '*')
+    res.headers.set('Access-Control-Allow-Methods', 'GET,POST,PUT,DELETE,OPTIONS,PATCH')
+    res.headers.set('Access-Control-Allow-Headers', 'Content-Type,Authorization,X-Timezone,If-None-Match,If-Modified-Since')
+    res.headers.set('Access-Control-Expose-Headers', 'ETag,Last-Modified,Content-Encoding')
+    res.headers.set('Access-Control-Allow-Credentials', 'true')
+    return res
+}
+
+export function json(data, status = 200) {
+    return cors(new NextResponse(JSON.stringify(data), { status }))
+}
+
+function digest(value) {
+    return createHash('sha256').update(value).digest()
+}
+
+// Bulk and destructive endpoints need `Authorization: Bearer $ADMIN_TOKEN`; without the
+// env var they are disabled. Returns the error response, or null if the caller may proceed.
+export function requireAdmin(req) {
+    const token = process.env.ADMIN_TOKEN
+    if (!token) return json({ error: 'This endpoint is disabled, set ADMIN_TOKEN to enable it' }, 403)
+    const given = (req.headers.get('authorization') || '').replace(/^Bearer\s+/i, '')
+    if (!given || !timingSafeEqual(digest(given), digest(token))) return json({ error: 'Admin token required' }, 401)
+    return null
+}
+
+function negotiateEncoding(req) {
+    const q = {}
+    for (const part of (req.headers.get('accept-encoding') || '').split(',')) {
+        const [name, ...params] = part.trim().toLowerCase().split(';')
+        const weight = params.map(p => p.trim()).find(p => p.startsWith('q='))
+        q[name] = weight ? Number(weight.slice(2)) : 1
+    }
+    if (q.br > 0) return 'br'
+    if (q.gzip > 0) return 'gzip'
+    return null
+}
+
+function etagMatches(req, etag) {
+    const header = req.headers.get('if-none-match')
+    if (!header) return false
+    if (header.trim() === '*') return true
+    return header.split(',').some(t => t.trim().replace(/^W\//, '') === etag)
+}
+
+// HTTP dates have whole-second resolution. A change still inside the current second could be
+// followed by another write in that same second, so it is advertised as the second before:
+// the client's next If-Modified-Since is then older than any write it has not seen yet.
+function httpDate(lastModified) {
+    const second = Math.floor(new Date(lastModified).getTime() / 1000) * 1000
+    return Math.min(second, Math.floor(Date.now() / 1000) * 1000 - 1000)
+}
+
+// If-Modified-Since is only honoured when the client sent no If-None-Match (RFC 9110 13.1.3)
+function notModifiedSince(req, lastModified) {
+    if (!lastModified || req.headers.get('if-none-match')) return false
+    const since = Date.parse(req.headers.get('if-modified-since') || '')
+    return !isNaN(since) && Math.floor(new Date(lastModified).getTime() / 1000) * 1000 <= since
+}
+
+function validatorHeaders(lastModified) {
+    const headers = { 'Content-Type': 'application/json', 'Cache-Control': 'no-cache', Vary: 'Accept-Encoding' }
+    if (lastModified) headers['Last-Modified'] = new Date(httpDate(lastModified)).toUTCString()
+    return headers
+}
+
+// Cheap pre-check for routes that know their Last-Modified before building the body
+export function notModified(req, lastModified) {
+    if (!notModifiedSince(req, lastModified)) return null
+    return cors(new NextResponse(null, { status: 304, headers: validatorHeaders(lastModified) }))
+}
+
+// JSON response with a strong ETag, optional Last-Modified, 304 handling and
+// negotiated brotli/gzip above COMPRESS_MIN_BYTES. The ETag is per encoding, as
+// each encoding is a distinct representation.
+export function send(req, data, { lastModified } = {}) {
+    const body = Buffer.from(JSON.stringify(data))
+    const encoding = body.length >= COMPRESS_MIN_BYTES ? negotiateEncoding(req) : null
+    const hash = createHash('sha1').update(body).digest('base64url')
+    const etag = `"${hash}${encoding ? `-${encoding}` : ''}"`
+    const headers = { ...validatorHeaders(lastModified), ETag: etag }
+
+    if (etagMatches(req, etag) || notModifiedSince(req, lastModified)) {
+        return cors(new NextResponse(null, { status: 304, headers }))
+    }
+
+    let payload = body
+    if (encoding === 'br') payload = brotliCompressSync(body, { params: { [zlibConstants.BROTLI_PARAM_QUALITY]: 5 } })
+    if (encoding === 'gzip') payload = gzipSync(body, { level: 6 })
+    if (encoding) headers['Content-Encoding'] = encoding
+    return cors(new NextResponse(payload, { status: 200, headers }))
+}
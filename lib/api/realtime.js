@@ -0,0 +1,131 @@
+import { callGeminiAPI, streamGeminiAPI } from './gemini'
+
+function normalizeTypos(t) {
+    return t
+        .replace(/\bablout\b/gi, 'about')
+        .replace(/\babput\b/gi, 'about')
+        .replace(/\babotu\b/gi, 'about')
+}
+
+function extractNewsQuery(text) {
+    const f = normalizeTypos(text)
+    const m1 = f.match(/latest news(?: about| on)?\s+([^?.!,\n]+)/i)
+    if (m1) return m1[1].trim()
+    const m2 = f.match(/latest news about (him|her|them)/i)
+    if (m2) {
+        const m3 = f.match(/who is ([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)/i)
+        if (m3) return m3[1]
+    }
+    return null
+}
+
+// Early-abort trigger: only an actual refusal ("I don't have access to real-time data",
+// "I can't provide live prices", "my knowledge cutoff"), never a plain mention of real-time,
+// which grounded answers legitimately make ("here is the real-time price...")
+const RT_DISCLAIMER = new RegExp([
+    "\\b(?:do not|don't|cannot|can't|can not|am unable to|am not able to|unable to)\\s+(?:have|get|provide|offer|access|browse|check|fetch|retrieve)\\s+(?:\\w+\\s+){0,3}?(?:real[- ]time|live|current|up[- ]to[- ]date)\\b",
+    "\\bI\\s+(?:do not|don't)\\s+(?:have|get|possess).{0,40}access",
+    "\\bno\\s+(?:access\\s+to\\s+)?(?:real[- ]time|live)\\s+(?:data|information|access)",
+    "\\b(?:my|the)\\s+(?:knowledge|training(?: data)?)\\s+(?:cut-?off|only goes up to|is limited to)"
+].join('|'), 'i')
+
+// Counters for live-data completions; surfaced through GET /system/usage
+export const REALTIME_METRICS = { groundedCompletions: 0, disclaimerRetries: 0 }
+
+function groundingInstruction(ctx, strict = false) {
+    return [
+        'You are connected to live data sources. The LIVE DATA block below was fetched moments ago for this conversation.',
+        'Answer from it whenever it is relevant, quoting figures, times and headlines exactly as given.',
+        strict
+            ? 'You DO have real-time access through this data. Never say you lack real-time, live or current information; if the data does not cover the question, answer from general knowledge without any disclaimer.'
+            : 'Do not claim that you lack real-time or current information.',
+        '',
+        '--- LIVE DATA ---',
+        ctx.trim(),
+        '--- END LIVE DATA ---'
+    ].join('\n')
+}
+
+// Live context travels in systemInstruction. The first tokens of the stream are
+// checked for a real-time disclaimer so a bad generation is cancelled early and
+// restarted once with a stricter instruction instead of being finished and redone.
+export async function generateGrounded(msgs, ctx, temp, maxT) {
+    if (!ctx) return callGeminiAPI(msgs, { temperature: temp, maxTokens: maxT })
+    REALTIME_METRICS.groundedCompletions++
+    const opts = { temperature: temp, maxTokens: maxT }
+    const first = await streamGeminiAPI(msgs, {
+        ...opts,
+        system: groundingInstruction(ctx),
+        abortIf: text => RT_DISCLAIMER.test(text)
+    })
+    if (!first.aborted) return first
+    REALTIME_METRICS.disclaimerRetries++
+    return streamGeminiAPI(msgs, { ...opts, system: groundingInstruction(ctx, true) })
+}
+
+export async function buildRealtimeContext(text, tz) {
+    const tasks = []
+    if (/current time|time now/i.test(text)) tasks.push({ type: 'time' })
+    if (/today|date\b/i.test(text)) tasks.push({ type: 'date' })
+    if (/^\s*(who|what|where|when|how)\b/i.test(text) && text.length < 60) tasks.push({ type: 'search', query: text.trim() })
+    const nq = extractNewsQuery(text)
+    if (nq !== null) tasks.push({ type: 'news', query: nq })
+    if (/latest news\b/i.test(text) && nq === null) tasks.push({ type: 'news', query: '' })
+    text.split('\n').map(l => l.trim()).filter(Boolean).forEach(line => {
+        if (/^\/search\s+/i.test(line)) tasks.push({ type: 'search', query: line.slice(8).trim() })
+        if (/^\/news\b/i.test(line)) tasks.push({ type: 'news', query: line.replace(/^\/news\s*/i, '').trim() })
+        if (/^\/finance\s+/i.test(line)) tasks.push({ type: 'finance', symbol: line.slice(9).trim().toUpperCase() })
+    })
+    const mShare = text.match(/\b([A-Z]{3,10}|nifty)\b.*\b(price|share|stock)/i)
+    if (mShare) tasks.push({ type: 'finance', symbol: mShare[1].toUpperCase() })
+    if (!tasks.length) return ''
+    let ctx = ''
+    for (const t of tasks) {
+        if (t.type === 'time') {
+            const now = new Date().toLocaleString('en-US', {
+                hour: '2-digit', minute: '2-digit', second: '2-digit',
+                hour12: true, timeZone: tz, timeZoneName: 'short'
+            })
+            ctx += `Current time: ${now}\n\n`
+        }
+        if (t.type === 'date') {
+            const today = new Date().toLocaleDateString('en-CA', { timeZone: tz })
+            ctx += `Current date: ${today}\n\n`
+        }
+        if (t.type === 'search' && t.query) {
+            try {
+                const r = await fetch(`${process.env.SEARX_URL}/search?q=${encodeURIComponent(t.query)}&format=json&language=en`)
+                if (r.ok) {
+                    const { results = [] } = await r.json()
+                    ctx += `Web search for "${t.query}":\n`
+                    ctx += results.slice(0, 5).map(r => `Title: ${r.title}\nURL: ${r.url}\nSnippet: ${r.content}`).join('\n\n') + '\n\n'
+                }
+            } catch { }
+        }
+        if (t.type === 'news') {
+            try {
+                const endpoint = t.query
+                    ? `https://newsapi.org/v2/everything?q=${encodeURIComponent(t.query)}&pageSize=5&sortBy=publishedAt&apiKey=${process.env.NEWSAPI_KEY}`
+                    : `https://newsapi.org/v2/top-headlines?language=en&pageSize=5&apiKey=${process.env.NEWSAPI_KEY}`
+                const r = await fetch(endpoint)
+                if (r.ok) {
+                    const { articles = [] } = await r.json()
+                    ctx += `News ${t.query ? `about "${t.query}"` : 'headlines'}:\n`
+                    ctx += articles.slice(0, 5).map(a =>
+                        `Title: ${a.title}\nSource: ${a.source?.name}\nPublished: ${a.publishedAt}\nDesc: ${a.description}`
+                    ).join('\n\n') + '\n\n'
+                }
+            } catch { }
+        }
+        if (t.type === 'finance') {
+            try {
+                const r = await fetch(`https://finnhub.io/api/v1/quote?symbol=${t.symbol}&token=${process.env.FINNHUB_KEY}`)
+                if (r.ok) {
+                    const q = await r.json()
+                    ctx += `Live price ${t.symbol}: ₹${q.c} (open ₹${q.o}, high ₹${q.h})\n\n`
+                }
+            } catch { }
+        }
+    }
+    return ctx
+}
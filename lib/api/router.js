@@ -0,0 +1,58 @@
+import { json, requireAdmin } from './http'
+
+// Each entry names the module that owns the route and the handler it exports.
+// Modules are imported on first hit, so a request only loads what it uses.
+// `admin` routes are refused before their module loads unless the caller has the admin token.
+const ROUTES = [
+    { method: 'GET', path: '/', load: () => import('./routes/root'), handler: 'root' },
+    { method: 'GET', path: '/settings', load: () => import('./routes/settings'), handler: 'getSettings' },
+    { method: ['POST', 'PUT', 'PATCH'], path: '/settings', load: () => import('./routes/settings'), handler: 'updateSettings' },
+    { method: 'POST', path: '/chat/completions', load: () => import('./routes/chat'), handler: 'completions' },
+    { method: 'GET', path: '/chat/sessions', load: () => import('./routes/chat'), handler: 'listSessions' },
+    { method: 'GET', path: '/chat/sessions/:id', load: () => import('./routes/chat'), handler: 'getSession' },
+    { method: 'PATCH', path: '/chat/sessions/:id', load: () => import('./routes/chat'), handler: 'renameSession' },
+    { method: 'DELETE', path: '/chat/sessions/:id', load: () => import('./routes/chat'), handler: 'deleteSession' },
+    { method: 'DELETE', path: '/chat/sessions', load: () => import('./routes/chat'), handler: 'deleteSessions', admin: true },
+    { method: 'GET', path: '/system/usage', load: () => import('./routes/system'), handler: 'usage' },
+    { method: 'GET', path: '/system/health', load: () => import('./routes/system'), handler: 'health' },
+    { method: 'GET', path: '/system/warmup', load: () => import('./routes/system'), handler: 'warmup' },
+    { method: 'GET', path: '/system/compaction', load: () => import('./routes/system'), handler: 'compaction' },
+    { method: 'POST', path: '/system/compact', load: () => import('./routes/system'), handler: 'compact', admin: true },
+    { method: 'GET', path: '/search/web', load: () => import('./routes/search'), handler: 'web' },
+    { method: 'GET', path: '/news/search', load: () => import('./routes/news'), handler: 'search' },
+    { method: 'GET', path: '/news/latest', load: () => import('./routes/news'), handler: 'latest' },
+    { method: 'GET', path: '/companies/search', load: () => import('./routes/companies'), handler: 'search' },
+    { method: 'POST', path: '/files/analyze', load: () => import('./routes/files'), handler: 'analyze' },
+    { method: 'GET', path: '/export', load: () => import('./routes/backup'), handler: 'exportData', admin: true },
+    { method: 'POST', path: '/import', load: () => import('./routes/backup'), handler: 'importData', admin: true }
+].map(r => ({
+    ...r,
+    methods: new Set([].concat(r.method)),
+    parts: r.path.split('/').filter(Boolean)
+}))
+
+function matchRoute(route, seg) {
+    if (route.parts.length !== seg.length) return null
+    const params = {}
+    for (let i = 0; i < seg.length; i++) {
+        const p = route.parts[i]
+        if (p.startsWith(':')) params[p.slice(1)] = seg[i]
+        else if (p !== seg[i]) return null
+    }
+    return params
+}
+
+export async function dispatch(req, { params }) {
+    const seg = params.path || []
+    const path = '/' + seg.join('/')
+    for (const route of ROUTES) {
+        if (!route.methods.has(req.method)) continue
+        const routeParams = matchRoute(route, seg)
+        if (!routeParams) continue
+        const denied = route.admin && requireAdmin(req)
+        if (denied) return denied
+        const mod = await route.load()
+        return mod[route.handler](req, { path, params: routeParams })
+    }
+    return json({ error: `Route ${path} not found` }, 404)
+}
@@ -0,0 +1,225 @@
+import { NextResponse } from 'next/server'
+import { cors, json } from '../http'
+import { getPrisma, markChanged } from '../db'
+import { dropArchived, hydrate } from '../archive'
+
+const EXPORT_BATCH = 500
+const IMPORT_CHUNK = 250
+const FORMAT_VERSION = 1
+const MAX_REPORTED_ERRORS = 100
+
+// NDJSON record type -> Prisma delegate, the column used for `since` filters and the
+// columns an import may write ('?' = may be omitted or null; dates fall back to the default)
+const MODELS = {
+    ChatSession: {
+        delegate: 'chatSession', param: 'sessions', since: 'timestamp',
+        columns: { id: 'string', title: 'string?', messages: 'string', model: 'string?', timestamp: 'date?', usage: 'string?' }
+    },
+    FileAnalysis: {
+        delegate: 'fileAnalysis', param: 'files', since: 'uploadedAt',
+        columns: { id: 'string', filename: 'string', size: 'int', type: 'string', summary: 'string', uploadedAt: 'date?' }
+    }
+}
+
+const COLUMN_TYPES = {
+    string: v => typeof v === 'string',
+    int: v => Number.isInteger(v),
+    date: v => (typeof v === 'string' || typeof v === 'number') && !isNaN(new Date(v))
+}
+
+function selectedModels(u) {
+    const wanted = (u.searchParams.get('types') || 'sessions,files').split(',').map(s => s.trim())
+    return Object.keys(MODELS).filter(type => wanted.includes(MODELS[type].param))
+}
+
+// Yields rows in primary-key order, one batch in memory at a time
+async function* readBatches(delegate, where) {
+    let cursor = null
+    while (true) {
+        const rows = await delegate.findMany({
+            where,
+            orderBy: { id: 'asc' },
+            take: EXPORT_BATCH,
+            ...(cursor ? { cursor: { id: cursor }, skip: 1 } : {})
+        })
+        if (!rows.length) return
+        yield rows
+        if (rows.length < EXPORT_BATCH) return
+        cursor = rows[rows.length - 1].id
+    }
+}
+
+async function* exportLines(prisma, types, since) {
+    yield JSON.stringify({ type: 'meta', version: FORMAT_VERSION, exportedAt: new Date().toISOString(), since: since?.toISOString() || null, types }) + '\n'
+    for (const type of types) {
+        const model = MODELS[type]
+        const where = since ? { [model.since]: { gte: since } } : undefined
+        for await (const rows of readBatches(prisma[model.delegate], where)) {
+            // Archived rows are exported with their full bodies so dumps are complete
+            const full = await hydrate(prisma, type, rows)
+            yield full.map(data => JSON.stringify({ type, data })).join('\n') + '\n'
+        }
+    }
+}
+
+// GET /export?types=sessions,files&since=ISO&gzip=1
+export async function exportData(req) {
+    const u = new URL(req.url)
+    const sinceParam = u.searchParams.get('since')
+    const since = sinceParam ? new Date(sinceParam) : null
+    if (since && isNaN(since)) return json({ error: 'Invalid since timestamp' }, 400)
+    const gzip = ['1', 'true'].includes(u.searchParams.get('gzip'))
+
+    const prisma = await getPrisma()
+    const lines = exportLines(prisma, selectedModels(u), since)
+    const encoder = new TextEncoder()
+    // Pull-based: the next batch is only read from the DB once the client has drained the last one
+    let stream = new ReadableStream({
+        async pull(controller) {
+            const { value, done } = await lines.next()
+            if (done) controller.close()
+            else controller.enqueue(encoder.encode(value))
+        },
+        async cancel() {
+            await lines.return()
+        }
+    })
+    if (gzip) stream = stream.pipeThrough(new CompressionStream('gzip'))
+
+    const stamp = new Date().toISOString().slice(0, 19).replace(/[:T]/g, '-')
+    return cors(new NextResponse(stream, {
+        status: 200,
+        headers: {
+            'Content-Type': gzip ? 'application/gzip' : 'application/x-ndjson',
+            'Content-Disposition': `attachment; filename="export-${stamp}.ndjson${gzip ? '.gz' : ''}"`
+        }
+    }))
+}
+
+async function* readLines(body) {
+    const reader = body.pipeThrough(new TextDecoderStream()).getReader()
+    let buf = ''
+    while (true) {
+        const { value, done } = await reader.read()
+        if (done) break
+        buf += value
+        const lines = buf.split('\n')
+        buf = lines.pop()
+        for (const line of lines) if (line.trim()) yield line
+    }
+    if (buf.trim()) yield buf
+}
+
+// Copies only the model's known columns, so dumps from a newer schema or with extra keys
+// still import; returns { error } for a record Prisma would reject
+function toRow(type, data) {
+    const row = { archived: false }
+    for (const [col, spec] of Object.entries(MODELS[type].columns)) {
+        const optional = spec.endsWith('?')
+        const kind = optional ? spec.slice(0, -1) : spec
+        const value = data[col]
+        if (value === undefined || value === null) {
+            if (!optional) return { error: `Missing ${col}` }
+            if (value === null && kind !== 'date') row[col] = null
+            continue
+        }
+        if (!COLUMN_TYPES[kind](value)) return { error: `Invalid ${col}: expected ${kind}` }
+        row[col] = kind === 'date' ? new Date(value) : value
+    }
+    return { row }
+}
+
+function upsertAll(prisma, type, rows) {
+    const delegate = prisma[MODELS[type].delegate]
+    return prisma.$transaction([
+        ...rows.map(row => delegate.upsert({ where: { id: row.id }, create: row, update: row })),
+        dropArchived(prisma, type, rows.map(r => r.id))
+    ])
+}
+
+// Upserts keep re-imports and overlapping incremental exports idempotent. A chunk the
+// database rejects is retried row by row so one bad record only costs its own line.
+async function flush(prisma, type, pending, errors) {
+    let imported = pending.length
+    try {
+        await upsertAll(prisma, type, pending.map(p => p.row))
+    } catch {
+        imported = 0
+        for (const { row, line } of pending) {
+            try {
+                await upsertAll(prisma, type, [row])
+                imported++
+            } catch (e) {
+                errors.push({ line, error: String(e?.message || e).split('\n').pop().trim() })
+            }
+        }
+    }
+    if (imported) markChanged(type)
+    return imported
+}
+
+// Keeps the first MAX_REPORTED_ERRORS entries and only counts the rest, so an import that
+// is bad throughout still runs in constant memory
+function errorLog() {
+    const log = { entries: [], count: 0 }
+    log.push = (entry) => {
+        if (log.count++ < MAX_REPORTED_ERRORS) log.entries.push(entry)
+    }
+    return log
+}
+
+// POST /import with an NDJSON body (plain, or gzip via Content-Encoding / application/gzip)
+export async function importData(req) {
+    if (!req.body) return json({ error: 'NDJSON body required' }, 400)
+    const gzipped = /gzip/i.test(req.headers.get('content-encoding') || '') || /gzip/i.test(req.headers.get('content-type') || '')
+    const body = gzipped ? req.body.pipeThrough(new DecompressionStream('gzip')) : req.body
+
+    const prisma = await getPrisma()
+    const pending = Object.fromEntries(Object.keys(MODELS).map(type => [type, []]))
+    const imported = Object.fromEntries(Object.keys(MODELS).map(type => [type, 0]))
+    const errors = errorLog()
+    let lineNo = 0
+
+    try {
+        for await (const line of readLines(body)) {
+            lineNo++
+            let rec
+            try {
+                rec = JSON.parse(line)
+            } catch {
+                errors.push({ line: lineNo, error: 'Invalid JSON' })
+                continue
+            }
+            if (rec.type === 'meta') {
+                if (rec.version > FORMAT_VERSION) return json({ error: `Unsupported export version ${rec.version}` }, 400)
+                continue
+            }
+            if (!MODELS[rec.type]) {
+                errors.push({ line: lineNo, error: `Unknown record type ${rec.type}` })
+                continue
+            }
+            if (!rec.data || typeof rec.data !== 'object' || !rec.data.id) {
+                errors.push({ line: lineNo, error: 'Record has no data.id' })
+                continue
+            }
+            const { row, error } = toRow(rec.type, rec.data)
+            if (error) {
+                errors.push({ line: lineNo, error })
+                continue
+            }
+            pending[rec.type].push({ row, line: lineNo })
+            if (pending[rec.type].length >= IMPORT_CHUNK) {
+                imported[rec.type] += await flush(prisma, rec.type, pending[rec.type], errors)
+                pending[rec.type] = []
+            }
+        }
+        for (const type of Object.keys(MODELS)) {
+            if (!pending[type].length) continue
+            imported[type] += await flush(prisma, type, pending[type], errors)
+        }
+    } catch (e) {
+        return json({ error: 'Import failed', details: String(e), line: lineNo, imported }, 500)
+    }
+
+    return json({ imported, errors: errors.entries, errorCount: errors.count })
+}
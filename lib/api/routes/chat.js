@@ -0,0 +1,141 @@
+import { randomUUID } from 'crypto'
+import { json, notModified, send } from '../http'
+import { getPrisma, lastChanged, markChanged } from '../db'
+import { dropArchived, restore } from '../archive'
+import { buildRealtimeContext, generateGrounded } from '../realtime'
+
+function serializeSession(s) {
+    return {
+        id: s.id,
+        title: s.title,
+        model: s.model,
+        timestamp: s.timestamp,
+        messages: JSON.parse(s.messages),
+        usage: s.usage ? JSON.parse(s.usage) : undefined,
+        archived: s.archived || undefined
+    }
+}
+
+async function recentSessions(prisma) {
+    const list = await prisma.chatSession.findMany({ orderBy: { timestamp: 'desc' }, take: 100 })
+    return list.map(serializeSession)
+}
+
+// Newest session activity, or the last rename/delete/archive if that came later
+async function sessionsLastModified(prisma) {
+    const latest = await prisma.chatSession.findFirst({ orderBy: { timestamp: 'desc' }, select: { timestamp: true } })
+    return Math.max(latest ? new Date(latest.timestamp).getTime() : 0, lastChanged('ChatSession'))
+}
+
+// The client's history for an archived session may be the listed stub, so it must never
+// overwrite the archive: restore the row and hand the transcript back for a resend
+async function archivedConflict(prisma, row) {
+    const session = await restore(prisma, 'ChatSession', row)
+    if (!session) return json({ error: 'Session not found' }, 404)
+    return json({ error: 'This chat was archived and has been reloaded, please resend your message', session: serializeSession(session) }, 409)
+}
+
+export async function completions(req) {
+    const tz = req.headers.get('x-timezone') || Intl.DateTimeFormat().resolvedOptions().timeZone
+    const { sessionId, messages, model, temperature, max_tokens } = await req.json()
+    if (!Array.isArray(messages))
+        return json({ error: 'Messages array required' }, 400)
+
+    const prisma = await getPrisma()
+    if (sessionId) {
+        const row = await prisma.chatSession.findUnique({ where: { id: sessionId }, select: { id: true, archived: true } })
+        if (!row) return json({ error: 'Session not found' }, 404)
+        if (row.archived) return archivedConflict(prisma, row)
+    }
+
+    const lastUser = [...messages].reverse().find(m => m.role === 'user')
+    const live = lastUser ? await buildRealtimeContext(lastUser.content, tz) : ''
+    const ai = await generateGrounded(messages, live, temperature, max_tokens)
+
+    const combined = [...messages, { role: 'assistant', content: ai.content }]
+    let chatId = sessionId
+
+    if (chatId) {
+        // Only rewrite a live row: one archived while the model was answering keeps its transcript
+        const { count } = await prisma.chatSession.updateMany({
+            where: { id: chatId, archived: false },
+            data: { messages: JSON.stringify(combined), timestamp: new Date() }
+        })
+        if (!count) {
+            const row = await prisma.chatSession.findUnique({ where: { id: chatId } })
+            if (!row) return json({ error: 'Session not found' }, 404)
+            return archivedConflict(prisma, row)
+        }
+    } else {
+        const rec = await prisma.chatSession.create({
+            data: {
+                id: randomUUID(),
+                title: messages.find(m => m.role === 'user')?.content.slice(0, 50) || 'New Chat',
+                messages: JSON.stringify(combined),
+                model: model || 'gemini-2.0-flash',
+                usage: JSON.stringify(ai.usage)
+            }
+        })
+        chatId = rec.id
+    }
+
+    return json({
+        id: chatId,
+        object: 'chat.completion',
+        created: Math.floor(Date.now() / 1000),
+        model: model || 'gemini-2.0-flash',
+        choices: [{ index: 0, message: { role: 'assistant', content: ai.content }, finish_reason: 'stop' }],
+        usage: ai.usage
+    })
+}
+
+export async function listSessions(req) {
+    const prisma = await getPrisma()
+    const lastModified = await sessionsLastModified(prisma)
+    return notModified(req, lastModified) || send(req, await recentSessions(prisma), { lastModified })
+}
+
+// Single session with its full transcript; archived sessions are restored on access
+export async function getSession(req, { params }) {
+    const prisma = await getPrisma()
+    const row = await prisma.chatSession.findUnique({ where: { id: params.id } })
+    if (!row) return json({ error: 'Session not found' }, 404)
+    const session = await restore(prisma, 'ChatSession', row)
+    if (!session) return json({ error: 'Session not found' }, 404)
+    const lastModified = Math.max(new Date(session.timestamp).getTime(), lastChanged('ChatSession'))
+    return send(req, serializeSession(session), { lastModified })
+}
+
+export async function renameSession(req, { params }) {
+    const { title } = await req.json()
+    const prisma = await getPrisma()
+    await prisma.chatSession.update({
+        where: { id: params.id },
+        data: { title: title?.slice(0, 100) || 'Untitled Chat' }
+    })
+    markChanged('ChatSession')
+    return send(req, await recentSessions(prisma))
+}
+
+export async function deleteSession(req, { params }) {
+    const prisma = await getPrisma()
+    await prisma.$transaction([
+        prisma.chatSession.delete({ where: { id: params.id } }),
+        dropArchived(prisma, 'ChatSession', [params.id])
+    ])
+    markChanged('ChatSession')
+    return send(req, await recentSessions(prisma))
+}
+
+// Bulk delete by id prefix, for scripts that seed throwaway sessions and clean up after themselves
+export async function deleteSessions(req) {
+    const prefix = new URL(req.url).searchParams.get('prefix') || ''
+    if (prefix.length < 4) return json({ error: 'prefix of at least 4 characters required' }, 400)
+    const prisma = await getPrisma()
+    const [{ count }] = await prisma.$transaction([
+        prisma.chatSession.deleteMany({ where: { id: { startsWith: prefix } } }),
+        prisma.archive.deleteMany({ where: { kind: 'ChatSession', recordId: { startsWith: prefix } } })
+    ])
+    if (count) markChanged('ChatSession')
+    return json({ deleted: count })
+}
@@ -0,0 +1,376 @@
+import { randomUUID } from 'crypto'
+import { json, send } from '../http'
+import { cached, peek } from '../cache'
+import { companyKey, maxAge, recordQuery } from '../warmup'
+
+function toTitleCase(s = '') {
+    return s.replace(/\w\S*/g, t => t.charAt(0).toUpperCase() + t.slice(1).toLowerCase())
+}
+
+const COMPANY_ALIASES = {
+    'google': ['google', 'alphabet inc', 'alphabet'],
+    'alphabet': ['alphabet inc', 'alphabet', 'google'],
+    'openai': ['openai', 'open ai', 'open-ai'],
+    'microsoft': ['microsoft', 'msft'],
+    'meta': ['meta', 'facebook', 'meta platforms'],
+    'xai': ['xai'],
+    'anthropic': ['anthropic', 'claude'],
+    'nvidia': ['nvidia', 'nvda'],
+    'tesla': ['tesla', 'tsla']
+}
+
+function companyAliases(name = '') {
+    const s = name.trim().toLowerCase()
+    return COMPANY_ALIASES[s] || [s]
+}
+
+function normalizeName(s = '') {
+    return s.toLowerCase().replace(/[^a-z0-9]+/g, '')
+}
+
+function nameLooksLikeQuery(label = '', q = '', aliases = []) {
+    const L = normalizeName(label)
+    const Q = normalizeName(q)
+    if (!L || !Q) return false
+    if (L === Q || L.includes(Q) || Q.includes(L)) return true
+    return aliases.some(a => normalizeName(a) === L)
+}
+
+// Every upstream request of one lookup goes through here: `lookup.calls` counts them per
+// service (the warm-up scheduler charges its budgets with it) and `lookup.failed` notes an
+// outage, so an empty result caused by one is not mistaken for "no such company"
+function newLookup() {
+    return { calls: {}, failed: false }
+}
+
+async function upstreamFetch(lookup, upstream, url) {
+    lookup.calls[upstream] = (lookup.calls[upstream] || 0) + 1
+    try {
+        const res = await fetch(url, { cache: 'no-store' })
+        if (res.status === 429 || res.status >= 500) lookup.failed = true
+        return res
+    } catch (e) {
+        lookup.failed = true
+        throw e
+    }
+}
+
+async function wikidataSearchItem(lookup, q) {
+    try {
+        const url = `https://www.wikidata.org/w/api.php?action=wbsearchentities&search=${encodeURIComponent(q)}&language=en&format=json&type=item&limit=10&origin=*`
+        const r = await upstreamFetch(lookup, 'wikidata', url)
+        if (!r.ok) return null
+        const j = await r.json()
+        if (!j || !Array.isArray(j.search) || !j.search.length) return null
+        const ranked = [...j.search].sort((a, b) => {
+            const aw = /company|technology|software|artificial|intelligence|organization/i.test(a.description || '') ? 0 : 1
+            const bw = /company|technology|software|artificial|intelligence|organization/i.test(b.description || '') ? 0 : 1
+            return aw - bw
+        })
+        return ranked[0]
+    } catch { return null }
+}
+
+async function wikidataGetEntity(lookup, qid) {
+    try {
+        const url = `https://www.wikidata.org/wiki/Special:EntityData/${qid}.json`
+        const r = await upstreamFetch(lookup, 'wikidata', url)
+        if (!r.ok) return null
+        const j = await r.json()
+        return j && j.entities && j.entities[qid] ? j.entities[qid] : null
+    } catch { return null }
+}
+
+// P31 instance of -> accept common company/org types
+const COMPANY_TYPES = new Set(['Q783794', 'Q43229', 'Q4830453', 'Q167037', 'Q891723', 'Q79913', 'Q724945', 'Q6881511'])
+
+function isCompanyEntity(entity) {
+    const claims = entity?.claims?.P31 || []
+    return claims.some(s => {
+        const id = s?.mainsnak?.datavalue?.value?.id
+        return id && COMPANY_TYPES.has(id)
+    })
+}
+
+function parseWikidataTime(wbt) {
+    if (!wbt || typeof wbt !== 'string') return ''
+    const m = wbt.match(/\+?(\d{4})(?:-(\d{2}))?(?:-(\d{2}))?/)
+    if (!m) return ''
+    const [_, y, mo, d] = m
+    if (y && mo && d) return `${y}-${mo}-${d}`
+    if (y && mo) return `${y}-${mo}`
+    return y || ''
+}
+
+function labelValue(entity, pid) {
+    const c = entity?.claims?.[pid]?.[0]?.mainsnak?.datavalue
+    if (!c) return ''
+    const v = c.value
+    if (typeof v === 'string') return v
+    if (typeof v === 'object' && v.id) return v.id
+    return ''
+}
+
+async function resolveQidLabels(lookup, qids = []) {
+    if (!qids.length) return {}
+    try {
+        const ids = Array.from(new Set(qids)).join('|')
+        const url = `https://www.wikidata.org/w/api.php?action=wbgetentities&ids=${ids}&props=labels&languages=en&format=json&origin=*`
+        const r = await upstreamFetch(lookup, 'wikidata', url)
+        if (!r.ok) return {}
+        const j = await r.json()
+        const out = {}
+        Object.keys(j.entities || {}).forEach(id => {
+            out[id] = j.entities[id]?.labels?.en?.value || id
+        })
+        return out
+    } catch { return {} }
+}
+
+async function wikipediaSummaryFromTitle(lookup, title) {
+    try {
+        const url = `https://en.wikipedia.org/api/rest_v1/page/summary/${encodeURIComponent(title)}`
+        const r = await upstreamFetch(lookup, 'wikipedia', url)
+        if (!r.ok) return null
+        const j = await r.json()
+        if (!j || j.type === 'disambiguation') return null
+        return j
+    } catch { return null }
+}
+
+async function wikipediaSummaryForEntity(lookup, entity) {
+    const enTitle = entity?.sitelinks?.enwiki?.title
+    if (enTitle) return await wikipediaSummaryFromTitle(lookup, enTitle)
+    const label = entity?.labels?.en?.value
+    if (label) return await wikipediaSummaryFromTitle(lookup, label)
+    return null
+}
+
+function safeCompanySkeleton(name = '') {
+    return {
+        id: randomUUID(),
+        name,
+        industry: 'Technology',
+        description: '',
+        employees: 'Unknown',
+        founded: '',
+        headquarters: 'Unknown',
+        website: '',
+        logo: null,
+        ticker: '',
+        valuation: 0,          // public: market cap; private: inferred valuation
+        tags: [],
+        lastUpdated: new Date().toISOString()
+    }
+}
+
+function formatNumber(n) {
+    if (!n || isNaN(n)) return ''
+    return n.toString().replace(/\B(?=(\d{3})+(?!\d))/g, ',')
+}
+
+function pickLatestEmployees(claims) {
+    const list = (claims?.P1128 || []).map(s => {
+        const val = s?.mainsnak?.datavalue?.value?.amount || s?.mainsnak?.datavalue?.value
+        const raw = typeof val === 'string' && val.startsWith('+') ? val.slice(1) : val
+        const num = raw ? Number(raw) : NaN
+        const time = (s?.qualifiers?.P585?.[0]?.datavalue?.value?.time) || ''
+        return { num: isNaN(num) ? null : num, date: parseWikidataTime(time) }
+    }).filter(x => x.num !== null)
+    if (!list.length) return ''
+    list.sort((a, b) => (a.date > b.date ? -1 : a.date < b.date ? 1 : 0))
+    return `${formatNumber(list[0].num)}${list[0].date ? ` (as of ${list[0].date})` : ''}`
+}
+
+function extractTicker(claims) {
+    const t = claims?.P249?.[0]?.mainsnak?.datavalue?.value
+    return typeof t === 'string' ? t : ''
+}
+
+// Real-time market cap from Yahoo (no API key)
+async function yahooMarketCap(lookup, ticker) {
+    if (!ticker) return 0
+    try {
+        const url = `https://query1.finance.yahoo.com/v7/finance/quote?symbols=${encodeURIComponent(ticker)}`
+        const r = await upstreamFetch(lookup, 'yahoo', url)
+        if (!r.ok) return 0
+        const j = await r.json()
+        const cap = j?.quoteResponse?.result?.[0]?.marketCap
+        return typeof cap === 'number' ? cap : 0
+    } catch { return 0 }
+}
+
+// Dollar text parser
+function parseDollarsFromText(text = '') {
+    const m = [...text.matchAll(/\$?\s?([\d,.]+)\s*(b|bn|billion|m|million)/gi)]
+    if (!m.length) return 0
+    const toNum = (val, unit) => {
+        const n = Number(val.replace(/,/g, ''))
+        if (!n) return 0
+        if (/^b|bn|billion$/i.test(unit)) return Math.round(n * 1e9)
+        if (/^m|million$/i.test(unit)) return Math.round(n * 1e6)
+        return n
+    }
+    return m.reduce((max, g) => Math.max(max, toNum(g[1], g[2])), 0)
+}
+
+// Private-company valuation only (no funding)
+async function newsapiValuationOnly(lookup, name, aliases) {
+    try {
+        if (!process.env.NEWSAPI_KEY) return 0
+        const qExpr = aliases.map(s => (/\s/.test(s) ? `"${s}"` : s)).join(' OR ')
+        const params = new URLSearchParams({
+            q: qExpr,
+            language: 'en',
+            searchIn: 'title,description',
+            from: new Date(Date.now() - 30 * 24 * 3600 * 1000).toISOString().slice(0, 10),
+            sortBy: 'publishedAt',
+            pageSize: '10',
+            apiKey: process.env.NEWSAPI_KEY || ''
+        })
+        const url = `https://newsapi.org/v2/everything?${params.toString()}`
+        const r = await upstreamFetch(lookup, 'newsapi', url)
+        if (!r.ok) return 0
+        const j = await r.json()
+        const articles = j.articles || []
+        if (!articles.length) return 0
+        const blob = articles.map(a => `${a.title} ${a.description}`).join('  ')
+
+        // Prefer numbers near "valuation"/"valued"/"worth"
+        const ctxMatches = [...blob.matchAll(
+            /(?:valu(?:ed|ation)|worth)[^$]{0,50}\$?\s?([\d,.]+)\s*(b|bn|billion|m|million)/gi
+        )]
+        if (ctxMatches.length) {
+            const candidates = ctxMatches.map(m => parseDollarsFromText(m[0]))
+            return candidates.reduce((a, b) => Math.max(a, b), 0)
+        }
+        // Fallback: largest $ figure (may be noisy, but avoids funding output)
+        return parseDollarsFromText(blob)
+    } catch { return 0 }
+}
+
+export async function search(req) {
+    const u = new URL(req.url)
+    const q = (u.searchParams.get('q') || '').trim()
+
+    // 1) Require at least 2 chars; otherwise empty list
+    if (q.length < 2) {
+        return json([])
+    }
+
+    const key = companyKey(q)
+    try {
+        const companies = await cached(key, maxAge('companies', key), () => resolveCompany(q))
+        // Only queries that name a company count towards the warm-up's top list, so typing
+        // prefixes and misses never spend its budget
+        if (companies.length) recordQuery(q)
+        return send(req, companies, { lastModified: peek(key)?.fetchedAt })
+    } catch (e) {
+        // Upstream outage: an older answer beats none, and nothing new was cached
+        const stale = peek(key)
+        if (stale) return send(req, stale.value, { lastModified: stale.fetchedAt })
+        return json({ error: 'Company lookup failed', details: String(e?.message || e) }, 502)
+    }
+}
+
+// An empty answer is only a real "no match" if every upstream responded
+function noMatch(lookup) {
+    if (lookup.failed) throw new Error('Company lookup failed: upstream unavailable')
+    return []
+}
+
+// Resolves a query to at most one validated company; shared by the route and the warm-up job
+export async function resolveCompany(q, lookup = newLookup()) {
+    // 2) Resolve via Wikidata using aliases
+    const aliases = companyAliases(q)
+    let item = null
+    for (const a of aliases) {
+        item = await wikidataSearchItem(lookup, a)
+        if (item) break
+        item = await wikidataSearchItem(lookup, toTitleCase(a))
+        if (item) break
+    }
+    if (!item) {
+        // No entity -> no results (prevents fake cards)
+        return noMatch(lookup)
+    }
+
+    // 3) Pull full entity and validate
+    const entity = await wikidataGetEntity(lookup, item.id)
+    const label = entity?.labels?.en?.value || item.label || ''
+    if (!label) {
+        return noMatch(lookup)
+    }
+    if (!isCompanyEntity(entity) || !nameLooksLikeQuery(label, q, aliases)) {
+        // Hard gate: if it’s not clearly the same company, show nothing
+        return noMatch(lookup)
+    }
+
+    // 4) Build company object from trustworthy sources
+    const company = safeCompanySkeleton(label)
+    const claims = entity?.claims || {}
+
+    // Wikipedia summary & logo
+    const wiki = await wikipediaSummaryForEntity(lookup, entity)
+    if (wiki?.extract) company.description = wiki.extract
+    if (wiki?.thumbnail?.source) company.logo = wiki.thumbnail.source
+
+    // Official site (P856) preferred; otherwise Wikipedia page
+    const site = claims?.P856?.[0]?.mainsnak?.datavalue?.value
+    if (site && /^https?:\/\//i.test(site)) {
+        company.website = site
+    } else if (wiki?.content_urls?.desktop?.page) {
+        company.website = wiki.content_urls.desktop.page
+    }
+
+    // Founded (P571)
+    const inception = claims?.P571?.[0]?.mainsnak?.datavalue?.value?.time
+    if (inception) company.founded = parseWikidataTime(inception)
+
+    // Employees (P1128, pick latest)
+    const emp = pickLatestEmployees(claims)
+    if (emp) company.employees = emp
+
+    // Industry (P452), HQ (P159), Country (P17)
+    const industryQ = labelValue(entity, 'P452')
+    const hqQ = labelValue(entity, 'P159')
+    const countryQ = labelValue(entity, 'P17')
+    const labelMap = await resolveQidLabels(lookup, [industryQ, hqQ, countryQ].filter(Boolean))
+    if (labelMap[industryQ]) company.industry = labelMap[industryQ]
+    if (labelMap[hqQ] && labelMap[countryQ]) {
+        company.headquarters = `${labelMap[hqQ]}, ${labelMap[countryQ]}`
+    } else if (labelMap[hqQ]) {
+        company.headquarters = labelMap[hqQ]
+    } else if (labelMap[countryQ]) {
+        company.headquarters = labelMap[countryQ]
+    }
+
+    // Public ticker (P249) → live market cap
+    company.ticker = (extractTicker(claims) || '').trim()
+    if (company.ticker) {
+        const cap = await yahooMarketCap(lookup, company.ticker)
+        if (cap) company.valuation = cap
+    }
+
+    // Private valuation (no funding at all)
+    if (!company.valuation) {
+        const val = await newsapiValuationOnly(lookup, company.name, aliases)
+        if (val) company.valuation = val
+    }
+
+    // Lightweight tags from description/aliases
+    const tags = new Set()
+    const t = (`${wiki?.extract || ''} ${wiki?.description || ''}`).toLowerCase()
+    aliases.forEach(a => tags.add(toTitleCase(a)))
+    if (/cloud/.test(t)) tags.add('Cloud')
+    if (/search/.test(t)) tags.add('Search')
+    if (/\bads?|advertis/.test(t)) tags.add('Ads')
+    if (/\bai|artificial intelligence/.test(t)) tags.add('AI')
+    if (/hardware|chip|gpu|semiconductor/.test(t)) tags.add('Hardware')
+    company.tags = Array.from(tags).slice(0, 8)
+
+    company.lastUpdated = new Date().toISOString()
+
+    // FINAL: return one **validated** company, with NO funding key
+    return [company]
+}
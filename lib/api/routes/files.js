@@ -0,0 +1,24 @@
+import { randomUUID } from 'crypto'
+import { json } from '../http'
+import { getPrisma } from '../db'
+import { callGeminiAPI } from '../gemini'
+
+export async function analyze(req) {
+    const form = await req.formData()
+    const file = form.get('file')
+    if (!file) return json({ error: 'File is required' }, 400)
+    const buf = Buffer.from(await file.arrayBuffer())
+    const txt = buf.toString('utf-8').slice(0, 20000)
+    const ai = await callGeminiAPI([{ role: 'user', content: `Summarize:\n\n${txt}` }], { temperature: 0.4, maxTokens: 250 })
+    const prisma = await getPrisma()
+    const rec = await prisma.fileAnalysis.create({
+        data: {
+            id: randomUUID(),
+            filename: file.name,
+            size: file.size,
+            type: file.type || '',
+            summary: ai.content
+        }
+    })
+    return json(rec)
+}
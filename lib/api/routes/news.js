@@ -0,0 +1,130 @@
+import { createHash } from 'crypto'
+import { json, send } from '../http'
+import { cached, peek } from '../cache'
+import { maxAge, newsKey } from '../warmup'
+
+const BRAND_ALIASES = {
+    'open ai': ['openai', 'open ai', 'open-ai'],
+    'openai': ['openai', 'open ai', 'open-ai'],
+    'google': ['google', 'alphabet'],
+    'anthropic': ['anthropic'],
+    'gemini': ['gemini', 'google gemini'],
+    'claude': ['claude', 'anthropic claude'],
+    'xai': ['xai'],
+    'meta': ['meta', 'facebook'],
+    'nvidia': ['nvidia'],
+    'microsoft': ['microsoft']
+}
+
+function normalizeBrand(q = '') {
+    const s = q.trim().toLowerCase()
+    const aliases = BRAND_ALIASES[s] || [s]
+    const primary = aliases[0]
+
+    // Strict regex: allow spaces or hyphens as variants, enforce word boundaries
+    const alt = aliases
+        .map(a => a.replace(/\s+|-+/g, '\\s*-?\\s*'))
+        .map(a => `\\b${a}\\b`)
+        .join('|')
+    const strictRegex = new RegExp(alt, 'i')
+
+    return { primary, aliases, strictRegex }
+}
+
+function inferCategoryFromTitle(title = '') {
+    const t = title.toLowerCase()
+    if (/(openai|claude|gemini|llama|artificial intelligence|\bai\b)/.test(t)) return 'ai'
+    if (/(quantum|physics|research|study)/.test(t)) return 'science'
+    if (/(startup|funding|acquire|merger|revenue|ipo)/.test(t)) return 'business'
+    if (/(health|medical|vaccine|diagnosis)/.test(t)) return 'health'
+    if (/(tech|software|hardware|chip|semiconductor)/.test(t)) return 'technology'
+    return 'all'
+}
+
+// Stable per article so identical result sets hash to the same ETag
+function articleId(a) {
+    const h = createHash('sha1').update(a.url || `${a.title}|${a.publishedAt}`).digest('hex')
+    return `${h.slice(0, 8)}-${h.slice(8, 12)}-${h.slice(12, 16)}-${h.slice(16, 20)}-${h.slice(20, 32)}`
+}
+
+function mapArticle(a) {
+    return {
+        id: articleId(a),
+        title: a.title,
+        summary: a.description,
+        content: a.content || a.description || '',
+        publishedAt: a.publishedAt,
+        source: a.source?.name || 'Unknown',
+        category: inferCategoryFromTitle(a.title || ''),
+        url: a.url,
+        imageUrl: a.urlToImage || null,
+        author: a.author || ''
+    }
+}
+
+export async function search(req) {
+    const u = new URL(req.url)
+    const raw = (u.searchParams.get('q') || '').trim()
+    const lang = u.searchParams.get('lang') || 'en'
+
+    if (raw.length < 2) {
+        return json([])
+    }
+
+    const { primary, aliases, strictRegex } = normalizeBrand(raw)
+
+    const from = new Date(Date.now() - 7 * 24 * 3600 * 1000).toISOString().slice(0, 10)
+    const phrase = (s) => (/\s/.test(s) ? `"${s}"` : s)
+
+    const qExpr = aliases.length > 1
+        ? `(${aliases.map(phrase).join(' OR ')})`
+        : phrase(primary)
+
+    const params = new URLSearchParams({
+        q: qExpr,
+        language: lang,
+        searchIn: 'title,description',
+        from,
+        sortBy: 'relevancy',
+        pageSize: '10',
+        apiKey: process.env.NEWSAPI_KEY || ''
+    })
+    params.append('qInTitle', primary)
+
+    try {
+        const r = await fetch(`https://newsapi.org/v2/everything?${params.toString()}`, { cache: 'no-store' })
+        if (!r.ok) {
+            const text = await r.text()
+            return json({ error: 'NewsAPI error', details: text }, r.status)
+        }
+
+        const { articles = [] } = await r.json()
+
+        const filtered = articles.filter((a) => {
+            const blob = `${a.title || ''} ${a.description || ''} ${a.content || ''}`.toLowerCase()
+            return strictRegex.test(blob)
+        })
+
+        return send(req, filtered.map(mapArticle))
+    } catch (e) {
+        return json({ error: 'Search failed', details: String(e) }, 500)
+    }
+}
+
+export async function loadLatestHeadlines(lang, calls = {}) {
+    calls.newsapi = (calls.newsapi || 0) + 1
+    const r = await fetch(`https://newsapi.org/v2/top-headlines?language=${lang}&pageSize=5&apiKey=${process.env.NEWSAPI_KEY}`)
+
+    if (!r.ok) throw new Error('NewsAPI error')
+    const { articles = [] } = await r.json()
+
+    return articles.map(mapArticle)
+}
+
+export async function latest(req) {
+    const u = new URL(req.url)
+    const lang = u.searchParams.get('lang') || 'en'
+    const key = newsKey(lang)
+    const articles = await cached(key, maxAge('news', key), () => loadLatestHeadlines(lang))
+    return send(req, articles, { lastModified: peek(key)?.fetchedAt })
+}
@@ -0,0 +1,5 @@
+import { json } from '../http'
+
+export async function root() {
+    return json({ message: 'AI Platform API Ready' })
+}
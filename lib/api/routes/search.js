@@ -0,0 +1,15 @@
+import { json } from '../http'
+
+export async function web(req) {
+    const u = new URL(req.url)
+    const q = u.searchParams.get('q') || ''
+    const lang = u.searchParams.get('lang') || 'en'
+    const r = await fetch(`${process.env.SEARX_URL}/search?q=${encodeURIComponent(q)}&format=json&language=${lang}`)
+    if (!r.ok) throw new Error('SearxNG error')
+    const { results = [] } = await r.json()
+    return json(results.map(r => ({
+        title: r.title,
+        link: r.url,
+        snippet: r.content
+    })))
+}
@@ -0,0 +1,14 @@
+import { json } from '../http'
+
+let SETTINGS_CACHE = { enabledModels: ['gemini-2.0-flash'] }
+
+export async function getSettings() {
+    return json(SETTINGS_CACHE)
+}
+
+// POST, PUT and PATCH all shallow-merge into the cached settings
+export async function updateSettings(req) {
+    const body = await req.json()
+    SETTINGS_CACHE = { ...SETTINGS_CACHE, ...body }
+    return json(SETTINGS_CACHE)
+}
@@ -0,0 +1,90 @@
+import { readdir } from 'fs/promises'
+import { json } from '../http'
+import { getPrisma } from '../db'
+import { REALTIME_METRICS } from '../realtime'
+import { warmupStatus } from '../warmup'
+import { compactionStatus, runCompaction } from '../compaction'
+
+export async function usage() {
+    const prisma = await getPrisma()
+    const totalChats = await prisma.chatSession.count()
+
+    const sessions = await prisma.chatSession.findMany({ select: { usage: true } })
+    let totalTokens = 0
+    for (const s of sessions) {
+        try {
+            const u = s.usage ? JSON.parse(s.usage) : null
+            if (u) {
+                totalTokens += Number(
+                    u.total_tokens ?? ((u.prompt_tokens || 0) + (u.completion_tokens || 0))
+                )
+            }
+        } catch { }
+    }
+
+    const COST_PER_1K_TOKENS = Number(process.env.COST_PER_1K_TOKENS || '0')
+    const estimatedCost = Number(((totalTokens / 1000) * COST_PER_1K_TOKENS).toFixed(4))
+    const { groundedCompletions, disclaimerRetries } = REALTIME_METRICS
+
+    return json({
+        totalChats,
+        totalTokens,
+        estimatedCost,
+        realtime: {
+            groundedCompletions,
+            disclaimerRetries,
+            disclaimerRetryRate: groundedCompletions ? Number((disclaimerRetries / groundedCompletions).toFixed(4)) : 0
+        },
+        lastUpdated: new Date().toISOString()
+    })
+}
+
+async function openFileDescriptors() {
+    try {
+        return (await readdir('/proc/self/fd')).length
+    } catch {
+        return null
+    }
+}
+
+// Process stats for long-running soak tests; cheap enough to poll every few seconds
+export async function health() {
+    const mem = process.memoryUsage()
+    return json({
+        pid: process.pid,
+        uptime: process.uptime(),
+        rss: mem.rss,
+        heapUsed: mem.heapUsed,
+        heapTotal: mem.heapTotal,
+        external: mem.external,
+        arrayBuffers: mem.arrayBuffers,
+        openFds: await openFileDescriptors(),
+        timestamp: new Date().toISOString()
+    })
+}
+
+export async function warmup() {
+    return json(warmupStatus())
+}
+
+export async function compaction() {
+    return json(await compactionStatus())
+}
+
+// Runs a compaction pass now; body may override { sessionDays, fileDays, vacuum } and
+// limit archiving to rows whose id starts with idPrefix (VACUUM still covers the whole file)
+export async function compact(req) {
+    const body = await req.json().catch(() => ({}))
+    const opts = {}
+    for (const key of ['sessionDays', 'fileDays']) {
+        if (body[key] === undefined) continue
+        if (typeof body[key] !== 'number' || body[key] < 0) return json({ error: `${key} must be a non-negative number` }, 400)
+        opts[key] = body[key]
+    }
+    if (typeof body.vacuum === 'boolean') opts.vacuum = body.vacuum
+    if (body.idPrefix !== undefined) {
+        if (typeof body.idPrefix !== 'string' || !body.idPrefix) return json({ error: 'idPrefix must be a non-empty string' }, 400)
+        opts.idPrefix = body.idPrefix
+    }
+    return json(await runCompaction(opts))
+}
@@ -0,0 +1,224 @@
+import { peek, refresh } from './cache'
+
+// Background warm-up of the lookups users hit first after a quiet period:
+// top headlines per language and company profiles (with market cap) for a
+// watchlist plus the most-requested /companies/search queries.
+const MINUTE = 60 * 1000
+const HOUR = 60 * MINUTE
+const DAY = 24 * HOUR
+
+function envList(name, fallback) {
+    return (process.env[name] || fallback).split(',').map(s => s.trim().toLowerCase()).filter(Boolean)
+}
+
+export const WARMUP_CONFIG = {
+    enabled: process.env.WARMUP_ENABLED ? process.env.WARMUP_ENABLED === 'true' : process.env.NODE_ENV === 'production',
+    newsLanguages: envList('WARMUP_NEWS_LANGS', 'en'),
+    newsInterval: Number(process.env.WARMUP_NEWS_INTERVAL_MS || HOUR),
+    companies: envList('WARMUP_COMPANIES', 'openai,google,nvidia,anthropic,microsoft,meta'),
+    topQueries: Number(process.env.WARMUP_TOP_QUERIES || 5),
+    companyInterval: Number(process.env.WARMUP_COMPANY_INTERVAL_MS || 12 * HOUR),
+    jitter: 0.15,
+    // Without the scheduler nothing refreshes entries in the background, so routes reuse them only briefly
+    coldMaxAge: {
+        news: Number(process.env.NEWS_CACHE_TTL_MS || 5 * MINUTE),
+        companies: Number(process.env.COMPANY_CACHE_TTL_MS || 10 * MINUTE)
+    },
+    // Calls per rolling day the scheduler may spend; the rest is left for user traffic
+    budgets: {
+        newsapi: Number(process.env.WARMUP_NEWSAPI_DAILY_BUDGET || 50),
+        wikidata: Number(process.env.WARMUP_WIKIDATA_DAILY_BUDGET || 500),
+        wikipedia: Number(process.env.WARMUP_WIKIPEDIA_DAILY_BUDGET || 200),
+        yahoo: Number(process.env.WARMUP_YAHOO_DAILY_BUDGET || 200)
+    }
+}
+
+// Worst case for one resolveCompany(): two Wikidata searches per alias (up to 3), the
+// entity and its labels, then Wikipedia, Yahoo and the NewsAPI valuation fallback.
+// A run is only started if this much is left; what it actually used is charged afterwards.
+const COMPANY_LOOKUP_COST = { wikidata: 8, wikipedia: 1, yahoo: 1, newsapi: 1 }
+const NEWS_LOOKUP_COST = { newsapi: 1 }
+
+// Keys the scheduler refreshes stay servable for 1.5 refresh intervals so jitter never lets
+// them go cold; every other key (and every key while the scheduler is off) gets the short cold TTL
+export function maxAge(job, key) {
+    if (!state.started || !scheduledKeys(job).has(key)) return WARMUP_CONFIG.coldMaxAge[job]
+    return 1.5 * (job === 'news' ? WARMUP_CONFIG.newsInterval : WARMUP_CONFIG.companyInterval)
+}
+
+export function newsKey(lang) {
+    return `news:latest:${lang}`
+}
+
+export function companyKey(q) {
+    return `company:${q.trim().toLowerCase()}`
+}
+
+// Shared with the route bundles, see lib/api/cache.js
+const state = globalThis.__warmupState ??= {
+    started: false,
+    jobs: new Map(),
+    queryCounts: new Map(),
+    spent: {}
+}
+const { jobs, queryCounts, spent } = state
+
+// ---- query popularity (bounded) ----
+const MAX_TRACKED_QUERIES = 500
+
+export function recordQuery(q) {
+    const key = q.trim().toLowerCase()
+    if (!key) return
+    queryCounts.set(key, (queryCounts.get(key) || 0) + 1)
+    if (queryCounts.size > MAX_TRACKED_QUERIES) {
+        const ranked = [...queryCounts.entries()].sort((a, b) => b[1] - a[1])
+        queryCounts.clear()
+        ranked.slice(0, Math.floor(MAX_TRACKED_QUERIES * 0.8)).forEach(([k, n]) => queryCounts.set(k, n))
+    }
+}
+
+function topQueries(n) {
+    return [...queryCounts.entries()].sort((a, b) => b[1] - a[1]).slice(0, n).map(([k]) => k)
+}
+
+// Lookups each job refreshes on its next run, by cache key
+function scheduledNames(job) {
+    if (job === 'news') return WARMUP_CONFIG.newsLanguages
+    return [...new Set([...WARMUP_CONFIG.companies, ...topQueries(WARMUP_CONFIG.topQueries)])]
+}
+
+function scheduledKeys(job) {
+    const toKey = job === 'news' ? newsKey : companyKey
+    return new Set(scheduledNames(job).map(toKey))
+}
+
+// ---- upstream budgets (rolling 24h) ----
+
+function usedLast24h(upstream) {
+    const now = Date.now()
+    spent[upstream] = (spent[upstream] || []).filter(t => now - t < DAY)
+    return spent[upstream].length
+}
+
+function hasBudget(cost) {
+    return Object.entries(cost).every(([u, n]) => usedLast24h(u) + n <= WARMUP_CONFIG.budgets[u])
+}
+
+function charge(calls) {
+    const now = Date.now()
+    for (const [u, n] of Object.entries(calls)) {
+        for (let i = 0; i < n; i++) (spent[u] ||= []).push(now)
+    }
+}
+
+// ---- jobs ----
+function jittered(ms) {
+    const j = WARMUP_CONFIG.jitter
+    return Math.round(ms * (1 - j + Math.random() * 2 * j))
+}
+
+// `load(calls)` counts the upstream requests it makes into `calls`; those are what gets charged
+async function warmItem(job, key, cost, load) {
+    const item = job.items[key] || (job.items[key] = { lastError: null, skipped: null })
+    if (!hasBudget(cost)) {
+        item.skipped = 'budget'
+        return
+    }
+    const calls = {}
+    try {
+        await refresh(key, () => load(calls))
+        item.lastError = null
+        item.skipped = null
+    } catch (e) {
+        item.lastError = String(e?.message || e)
+    } finally {
+        charge(calls)
+    }
+}
+
+// Drops status entries for keys that fell out of the schedule (e.g. a query that left the top list)
+function pruneItems(job) {
+    const keys = scheduledKeys(job.name)
+    for (const key of Object.keys(job.items)) {
+        if (!keys.has(key)) delete job.items[key]
+    }
+}
+
+async function runNews(job) {
+    const { loadLatestHeadlines } = await import('./routes/news')
+    pruneItems(job)
+    for (const lang of scheduledNames('news')) {
+        await warmItem(job, newsKey(lang), NEWS_LOOKUP_COST, calls => loadLatestHeadlines(lang, calls))
+    }
+}
+
+async function runCompanies(job) {
+    const { resolveCompany } = await import('./routes/companies')
+    pruneItems(job)
+    for (const name of scheduledNames('companies')) {
+        await warmItem(job, companyKey(name), COMPANY_LOOKUP_COST, calls => resolveCompany(name, { calls, failed: false }))
+    }
+}
+
+function schedule(name, interval, run) {
+    const job = { name, interval, lastRunAt: null, nextRunAt: null, running: false, items: {} }
+    jobs.set(name, job)
+    const tick = async () => {
+        job.running = true
+        try {
+            await run(job)
+        } catch (e) {
+            console.error(`Warm-up job ${name} failed:`, e)
+        } finally {
+            job.running = false
+            job.lastRunAt = Date.now()
+            plan(jittered(interval))
+        }
+    }
+    const plan = (delay) => {
+        job.nextRunAt = Date.now() + delay
+        const t = setTimeout(tick, delay)
+        t.unref?.()
+    }
+    // Stagger the first run so a restart does not burst every upstream at once
+    plan(Math.round(Math.random() * 5000))
+}
+
+export function startWarmup() {
+    if (state.started || !WARMUP_CONFIG.enabled) return
+    state.started = true
+    schedule('news', WARMUP_CONFIG.newsInterval, runNews)
+    schedule('companies', WARMUP_CONFIG.companyInterval, runCompanies)
+}
+
+export function warmupStatus() {
+    const now = Date.now()
+    const iso = t => (t ? new Date(t).toISOString() : null)
+    return {
+        enabled: WARMUP_CONFIG.enabled,
+        started: state.started,
+        budgets: Object.fromEntries(Object.entries(WARMUP_CONFIG.budgets).map(([u, limit]) => [
+            u, { limit, usedLast24h: usedLast24h(u) }
+        ])),
+        topQueries: topQueries(WARMUP_CONFIG.topQueries),
+        jobs: [...jobs.values()].map(job => ({
+            name: job.name,
+            running: job.running,
+            intervalMs: job.interval,
+            lastRunAt: iso(job.lastRunAt),
+            nextRunAt: iso(job.nextRunAt),
+            items: Object.entries(job.items).map(([key, item]) => {
+                const entry = peek(key)
+                const ageMs = entry ? now - entry.fetchedAt : null
+                return {
+                    key,
+                    lastRefresh: iso(entry?.fetchedAt),
+                    ageMs,
+                    fresh: ageMs !== null && ageMs < maxAge(job.name, key),
+                    lastError: item.lastError,
+                    skipped: item.skipped
+                }
+            })
+        }))
+    }
+}
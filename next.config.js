@@ -6,6 +6,7 @@ const nextConfig = {
     },
     experimental: {
         serverComponentsExternalPackages: [],
+        instrumentationHook: true,
     },
     webpack(config, { dev }) {
         if (dev) {
@@ -0,0 +1,21 @@
+-- AlterTable
+ALTER TABLE "ChatSession" ADD COLUMN "archived" BOOLEAN NOT NULL DEFAULT false;
+
+-- AlterTable
+ALTER TABLE "FileAnalysis" ADD COLUMN "archived" BOOLEAN NOT NULL DEFAULT false;
+
+-- CreateTable
+CREATE TABLE "Archive" (
+    "kind" TEXT NOT NULL,
+    "recordId" TEXT NOT NULL,
+    "payload" BLOB NOT NULL,
+    "archivedAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY ("kind", "recordId")
+);
+
+-- CreateIndex
+CREATE INDEX "ChatSession_timestamp_idx" ON "ChatSession"("timestamp");
+
+-- CreateIndex
+CREATE INDEX "FileAnalysis_uploadedAt_idx" ON "FileAnalysis"("uploadedAt");
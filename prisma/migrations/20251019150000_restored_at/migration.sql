@@ -0,0 +1,5 @@
+-- AlterTable
+ALTER TABLE "ChatSession" ADD COLUMN "restoredAt" DATETIME;
+
+-- AlterTable
+ALTER TABLE "FileAnalysis" ADD COLUMN "restoredAt" DATETIME;
@@ -3,47 +3,49 @@
 Simple Backend API Test to isolate specific issues
 """
 
-import requests
 import json
 import os
-from io import BytesIO
+
+from ai_platform_client import Client
 
 BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
 API_BASE = f"{BASE_URL}/api"
 
+api = Client(API_BASE, timeout=(5, 10))
+
 def test_file_upload_missing_file():
     """Test missing file scenario"""
     print("=== Testing Missing File Upload ===")
     try:
         # Test with empty files dict
-        response = requests.post(f"{API_BASE}/files/analyze", files={})
+        response = api.request("POST", "/files/analyze", files={})
         print(f"Empty files dict - Status: {response.status_code}")
         print(f"Response: {response.text}")
-        
+
         # Test with no files parameter
-        response = requests.post(f"{API_BASE}/files/analyze")
+        response = api.request("POST", "/files/analyze")
         print(f"No files parameter - Status: {response.status_code}")
         print(f"Response: {response.text}")
-        
+
     except Exception as e:
         print(f"Error: {e}")
 
 def test_error_handling():
     """Test error handling scenarios"""
     print("\n=== Testing Error Handling ===")
-    
+
     # Test invalid chat request
     try:
         payload = {"messages": "invalid"}
-        response = requests.post(f"{API_BASE}/chat/completions", json=payload, timeout=10)
+        response = api.request("POST", "/chat/completions", json=payload)
         print(f"Invalid chat - Status: {response.status_code}")
         print(f"Response: {response.text}")
     except Exception as e:
         print(f"Invalid chat error: {e}")
-    
+
     # Test non-existent route
     try:
-        response = requests.get(f"{API_BASE}/nonexistent", timeout=10)
+        response = api.request("GET", "/nonexistent")
         print(f"Non-existent route - Status: {response.status_code}")
         print(f"Response: {response.text}")
     except Exception as e:
@@ -52,7 +54,7 @@ def test_error_handling():
 def test_json_responses():
     """Test all endpoints for valid JSON"""
     print("\n=== Testing JSON Responses ===")
-    
+
     endpoints = [
         ("GET", "/"),
         ("GET", "/chat/sessions"),
@@ -61,10 +63,13 @@ def test_json_responses():
         ("GET", "/news/latest"),
         ("GET", "/companies/search?q=test")
     ]
-    
-    for method, endpoint in endpoints:
+
+    responses = api.batch(lambda e: api.request(*e), endpoints, return_exceptions=True)
+
+    for (method, endpoint), response in zip(endpoints, responses):
         try:
-            response = requests.get(f"{API_BASE}{endpoint}", timeout=10)
+            if isinstance(response, Exception):
+                raise response
             json_data = response.json()
             print(f"✅ {endpoint} - Valid JSON")
         except json.JSONDecodeError as e:
@@ -75,4 +80,4 @@ def test_json_responses():
 if __name__ == "__main__":
     test_json_responses()
     test_file_upload_missing_file()
-    test_error_handling()
\ No newline at end of file
+    test_error_handling()
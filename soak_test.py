@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Soak Test for the AI Platform API
+Drives mixed traffic for a configurable duration while sampling server memory,
+open file descriptors and latency, then flags leaks and latency creep
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from ai_platform_client import Client, Timings, percentile
+
+# (weight, name, method, path, request kwargs factory)
+TRAFFIC = [
+    (20, "root", "GET", "/", lambda: {}),
+    (20, "settings_get", "GET", "/settings", lambda: {}),
+    (5, "settings_post", "POST", "/settings", lambda: {"json": {"mode": random.choice(["single-model", "multi-model"])}}),
+    (20, "chat_sessions", "GET", "/chat/sessions", lambda: {}),
+    (10, "system_usage", "GET", "/system/usage", lambda: {}),
+    (10, "news_latest", "GET", "/news/latest", lambda: {}),
+    (10, "companies_search", "GET", "/companies/search", lambda: {"params": {"q": random.choice(["openai", "nvidia", "google"])}}),
+    (5, "not_found", "GET", "/nonexistent", lambda: {}),
+]
+LLM_TRAFFIC = [
+    (5, "chat_completions", "POST", "/chat/completions",
+     lambda: {"json": {"messages": [{"role": "user", "content": "Reply with OK."}], "max_tokens": 5}}),
+]
+# Writes a fresh key on every call; exposes unbounded growth of the settings cache
+SETTINGS_KEY_CHURN = (5, "settings_churn", "POST", "/settings", lambda: {"json": {f"soak-{uuid.uuid4().hex}": "x" * 256}})
+
+SERVER_METRICS = ("rss", "heapUsed", "heapTotal", "external", "openFds")
+
+
+def worker(api, traffic, deadline):
+    weights = [t[0] for t in traffic]
+    while time.time() < deadline:
+        _, name, method, path, make_kwargs = random.choices(traffic, weights=weights)[0]
+        try:
+            api.request(method, path, route=name, **make_kwargs())
+        except requests.RequestException:
+            pass  # recorded by the timing hook with its error
+
+
+def failed(call):
+    """4xx answers (e.g. the deliberate 404s) are expected traffic, not errors"""
+    return call.error is not None or call.status >= 500
+
+
+def percentiles(calls):
+    ms = [c.elapsed_ms for c in calls] or [0.0]
+    return {f"p{p}_ms": round(percentile(ms, p), 2) for p in (50, 95, 99)}
+
+
+def sample_server(probe, pid):
+    """Read process stats from /system/health, preferring /proc when the server runs locally"""
+    sample = {}
+    try:
+        sample.update(probe.health())
+    except (requests.RequestException, ValueError):
+        pass
+    if pid:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        sample["rss"] = int(line.split()[1]) * 1024
+            sample["openFds"] = len(os.listdir(f"/proc/{pid}/fd"))
+        except OSError:
+            pass
+    return sample
+
+
+def trend(series):
+    """Least-squares slope per hour plus the share of rising steps across window medians"""
+    points = [(t, v) for t, v in series if v is not None]
+    if len(points) < 4:
+        return {"slope_per_hour": 0.0, "rising_share": 0.0, "first": None, "last": None}
+    ts = [t for t, _ in points]
+    vs = [v for _, v in points]
+    mt, mv = statistics.fmean(ts), statistics.fmean(vs)
+    var = sum((t - mt) ** 2 for t in ts)
+    slope = sum((t - mt) * (v - mv) for t, v in points) / var if var else 0.0
+
+    # Median of each tenth of the run smooths out GC sawtooth before counting rises
+    n = max(2, min(10, len(vs) // 2))
+    size = len(vs) / n
+    medians = [statistics.median(vs[int(i * size):int((i + 1) * size)] or vs[-1:]) for i in range(n)]
+    rising = sum(1 for a, b in zip(medians, medians[1:]) if b > a) / (len(medians) - 1)
+    return {"slope_per_hour": slope * 3600, "rising_share": rising, "first": medians[0], "last": medians[-1]}
+
+
+def analyse(rows, growth_threshold, creep_threshold):
+    findings = []
+    summary = {}
+    for metric in SERVER_METRICS + ("p50_ms", "p95_ms"):
+        t = trend([(r["elapsed_s"], r.get(metric)) for r in rows])
+        summary[metric] = t
+        if t["first"] in (None, 0):
+            continue
+        growth = (t["last"] - t["first"]) / t["first"]
+        if metric in SERVER_METRICS:
+            if t["rising_share"] >= 0.8 and growth >= growth_threshold:
+                findings.append(f"{metric} grew monotonically by {growth:.0%} "
+                                f"({t['first']:.0f} -> {t['last']:.0f}, {t['slope_per_hour']:+.0f}/h)")
+        elif growth >= creep_threshold:
+            findings.append(f"{metric} crept by {growth:.0%} ({t['first']:.1f} ms -> {t['last']:.1f} ms)")
+    return summary, findings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--duration", type=float, default=3600, help="seconds to run (default: 1 hour)")
+    parser.add_argument("--interval", type=float, default=15, help="seconds between server samples")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--pid", type=int, help="Node server pid, to read RSS and fds from /proc directly")
+    parser.add_argument("--include-llm", action="store_true", help="mix in Gemini-backed chat completions")
+    parser.add_argument("--settings-churn", action="store_true", help="POST a new settings key on some requests")
+    parser.add_argument("--growth-threshold", type=float, default=0.25,
+                        help="flag server metrics that rise monotonically by at least this fraction")
+    parser.add_argument("--creep-threshold", type=float, default=0.5,
+                        help="flag latency percentiles that rise by at least this fraction")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--out", default=f"soak_report_{time.strftime('%Y%m%d_%H%M%S')}",
+                        help="directory for timeseries.csv and summary.json")
+    args = parser.parse_args()
+
+    traffic = TRAFFIC + (LLM_TRAFFIC if args.include_llm else []) + ([SETTINGS_KEY_CHURN] if args.settings_churn else [])
+
+    timings = Timings()
+    # One keep-alive connection per worker; the health probe has its own so it is never queued or timed
+    api = Client(timeout=args.timeout, max_connections=args.concurrency, hooks=[timings])
+    probe = Client(timeout=args.timeout, max_connections=1)
+
+    print("🧪 SOAK TEST")
+    print(f"API Base: {api.transport.base_url}")
+    print(f"Duration: {args.duration:.0f}s, interval {args.interval:.0f}s, concurrency {args.concurrency}")
+    print("=" * 60)
+
+    started = time.time()
+    deadline = started + args.duration
+    rows = []
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.concurrency):
+            pool.submit(worker, api, traffic, deadline)
+
+        while time.time() < deadline:
+            time.sleep(min(args.interval, max(0.0, deadline - time.time())))
+            calls = timings.drain()
+            row = {
+                "elapsed_s": round(time.time() - started, 1),
+                "requests": len(calls),
+                "errors": sum(1 for c in calls if failed(c)),
+                **percentiles(calls),
+            }
+            server = sample_server(probe, args.pid)
+            row.update({k: server.get(k) for k in SERVER_METRICS})
+            rows.append(row)
+            rss = f"{row['rss'] / 2**20:.1f} MiB" if row["rss"] else "n/a"
+            heap = f"{row['heapUsed'] / 2**20:.1f} MiB" if row["heapUsed"] else "n/a"
+            print(f"[{row['elapsed_s']:>7.0f}s] req={row['requests']:<5} err={row['errors']:<3} "
+                  f"p50={row['p50_ms']:.0f}ms p95={row['p95_ms']:.0f}ms rss={rss} heap={heap} fds={row['openFds']}")
+
+    api.close()
+    probe.close()
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, "timeseries.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()) if rows else ["elapsed_s"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    summary, findings = analyse(rows, args.growth_threshold, args.creep_threshold)
+    with open(os.path.join(args.out, "summary.json"), "w") as f:
+        json.dump({
+            "duration_s": args.duration,
+            "total_requests": sum(r["requests"] for r in rows),
+            "total_errors": sum(r["errors"] for r in rows),
+            "trends": summary,
+            "findings": findings,
+        }, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("🏁 SOAK TEST SUMMARY")
+    print("=" * 60)
+    if findings:
+        for finding in findings:
+            print(f"⚠️  {finding}")
+    else:
+        print("✅ No monotonic growth or latency creep detected")
+    print(f"Report written to {args.out}/")
+    return not findings
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)